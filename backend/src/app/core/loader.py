@@ -26,8 +26,6 @@ class BrainLoader:
         # Config: warmup solo lo crítico
         self.core_warmup_agents: Set[str] = {"phylactery", "mcp_admin"}
 
-    async def load_brain(self) -> None:
-        """Reloads all agents and skills from the filesystem."""
     async def load_brain(self) -> None:
         """Reloads all agents and skills from the filesystem."""
         # 1. Safe Reload: Close existing engines to prevent stale state
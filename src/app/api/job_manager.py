@@ -1,9 +1,9 @@
+import time
 import uuid
-from datetime import datetime
 from typing import Optional, List, Dict
 from sqlmodel import select
 from .models import RunStatus, RunResponse, JobEvent, EventType
-from ..core.db import async_session_maker, RunDB, EventDB
+from ..core.db import async_session_maker, RunDB, EventDB, event_queue, is_event_writer_running, ns_to_datetime
 
 class JobManager:
     """
@@ -68,6 +68,22 @@ class JobManager:
                 
             return self._map_to_response(run_db)
 
+    async def list_runs(
+        self,
+        owner_id: str,
+        status: Optional[RunStatus] = None,
+        limit: int = 50
+    ) -> List[RunResponse]:
+        """List a user's runs, newest first (served by ix_runs_owner_status_updated)."""
+        async with async_session_maker() as session:
+            statement = select(RunDB).where(RunDB.owner_id == owner_id)
+            if status is not None:
+                statement = statement.where(RunDB.status == status)
+            statement = statement.order_by(RunDB.updated_at.desc()).limit(limit)
+            results = await session.execute(statement)
+            
+            return [self._map_to_response(run_db) for run_db in results.scalars().all()]
+
     async def update_status(self, run_id: str, status: RunStatus) -> None:
         """Update the status of a run. Usually called by background tasks."""
         async with async_session_maker() as session:
@@ -77,18 +93,27 @@ class JobManager:
             
             if run_db:
                 run_db.status = status
-                run_db.updated_at = datetime.utcnow()
+                run_db.updated_at = time.time_ns()
                 session.add(run_db)
                 await session.commit()
 
     async def add_event(self, run_id: str, event_type: EventType, payload: Dict[str, object]) -> None:
-        """Add a typed event to the run's persistent history."""
+        """
+        Add a typed event to the run's persistent history.
+        Batched through the background event writer when it is running.
+        """
+        event_db = EventDB(
+            run_id=run_id,
+            event_type=event_type,
+            data=payload
+        )
+        
+        if is_event_writer_running():
+            # Writer also bumps the run's updated_at for the whole batch
+            await event_queue.put(event_db)
+            return
+        
         async with async_session_maker() as session:
-            event_db = EventDB(
-                run_id=run_id,
-                event_type=event_type,
-                data=payload
-            )
             session.add(event_db)
             
             # Also update run's updated_at
@@ -96,7 +121,7 @@ class JobManager:
             results = await session.execute(statement)
             run_db = results.scalar_one_or_none()
             if run_db:
-                run_db.updated_at = datetime.utcnow()
+                run_db.updated_at = time.time_ns()
                 session.add(run_db)
                 
             await session.commit()
@@ -121,7 +146,7 @@ class JobManager:
             events = event_results.scalars().all()
             
             return [
-                JobEvent(event_type=e.event_type, payload=e.data)
+                JobEvent(event_type=e.event_type, payload=e.data, timestamp=ns_to_datetime(e.timestamp))
                 for e in events
             ]
 
@@ -131,8 +156,8 @@ class JobManager:
             run_id=run_db.id,
             agent_name=run_db.agent_name,
             status=run_db.status,
-            created_at=run_db.created_at,
-            updated_at=run_db.updated_at,
+            created_at=ns_to_datetime(run_db.created_at),
+            updated_at=ns_to_datetime(run_db.updated_at),
             thread_id=run_db.thread_id,
             owner_id=run_db.owner_id
         )
@@ -8,9 +8,11 @@ Allows hybrid storage strategies, e.g.:
 Routes are matched by longest prefix.
 """
 
+import re
+from collections.abc import Iterator
 from typing import Optional, Callable
 
-from .protocol import BackendProtocol, FileInfo, WriteResult, EditResult, GrepMatch
+from .protocol import BackendProtocol, FileInfo, WriteResult, EditResult, GrepMatch, compile_pattern
 
 
 BackendFactory = Callable[["ToolRuntime"], BackendProtocol]  # type: ignore
@@ -97,30 +99,35 @@ class CompositeBackend(BackendProtocol):
         glob: Optional[str] = None
     ) -> list[GrepMatch] | str:
         """Search across all backends, aggregating results."""
-        all_matches: list[GrepMatch] = []
+        try:
+            regex = compile_pattern(pattern)
+        except re.error as e:
+            return f"Invalid regex pattern: {e}"
         
+        return list(self.grep_compiled(regex, path, glob))
+    
+    def grep_compiled(
+        self,
+        regex: re.Pattern[str],
+        path: Optional[str] = None,
+        glob: Optional[str] = None
+    ) -> Iterator[GrepMatch]:
+        """Search across all backends with one compiled pattern."""
         # Determine which backends to search
         if path:
             # Search only in the backend that handles this path
-            backend = self._get_backend(path)
-            result = backend.grep_raw(pattern, path, glob)
-            if isinstance(result, str):
-                return result  # Error
-            all_matches.extend(result)
+            backends_to_search = [self._get_backend(path)]
         else:
             # Search in all backends
             backends_to_search = [self.default]
             backends_to_search.extend(backend for _, backend in self.routes)
-            
-            for backend in backends_to_search:
-                result = backend.grep_raw(pattern, path, glob)
-                if isinstance(result, str):
-                    return result  # Error
-                all_matches.extend(result)
         
-        # Remove duplicates and sort
-        unique_matches = {(m.path, m.line, m.text): m for m in all_matches}
-        return sorted(unique_matches.values(), key=lambda x: (x.path, x.line))
+        # Remove duplicates and sort (needs the full set before yielding)
+        unique_matches: dict[tuple[str, int, str], GrepMatch] = {}
+        for backend in backends_to_search:
+            for m in backend.grep_compiled(regex, path, glob):
+                unique_matches[(m.path, m.line, m.text)] = m
+        yield from sorted(unique_matches.values(), key=lambda x: (x.path, x.line))
     
     def glob_info(self, pattern: str, path: str = "/") -> list[FileInfo]:
         """Find files across all backends."""
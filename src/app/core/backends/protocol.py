@@ -5,11 +5,23 @@ This module defines the interface that all backend implementations must follow.
 Based on LangChain Deep Agents BackendProtocol.
 """
 
+import re
+from collections.abc import Iterator
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from typing import Protocol, Optional
 
 
+@lru_cache(maxsize=128)
+def compile_pattern(pattern: str) -> re.Pattern[str]:
+    """
+    Compile a grep pattern, cached across calls (agents often repeat the
+    same search within a turn). Raises re.error for invalid patterns.
+    """
+    return re.compile(pattern)
+
+
 @dataclass
 class FileInfo:
     """Information about a file in the filesystem."""
@@ -101,6 +113,25 @@ class BackendProtocol(Protocol):
         """
         ...
     
+    def grep_compiled(
+        self,
+        regex: re.Pattern[str],
+        path: Optional[str] = None,
+        glob: Optional[str] = None
+    ) -> Iterator[GrepMatch]:
+        """
+        Search for an already compiled pattern in files, lazily.
+        
+        Args:
+            regex: Compiled pattern (see compile_pattern)
+            path: Optional directory to search in
+            glob: Optional glob pattern to filter files
+            
+        Yields:
+            GrepMatch objects
+        """
+        ...
+    
     def glob_info(self, pattern: str, path: str = "/") -> list[FileInfo]:
         """
         Find files matching a glob pattern.
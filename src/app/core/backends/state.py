@@ -7,12 +7,13 @@ a single thread/session. Data is lost when the agent restarts.
 Use case: Temporary working files, scratch pad, evicted tool results.
 """
 
+from collections.abc import Iterator
 from datetime import datetime
 from typing import Optional
 import re
 from fnmatch import fnmatch
 
-from .protocol import BackendProtocol, FileInfo, WriteResult, EditResult, GrepMatch
+from .protocol import BackendProtocol, FileInfo, WriteResult, EditResult, GrepMatch, compile_pattern
 
 
 class StateBackend(BackendProtocol):
@@ -98,11 +99,20 @@ class StateBackend(BackendProtocol):
     ) -> list[GrepMatch] | str:
         """Search for pattern in files."""
         try:
-            regex = re.compile(pattern)
+            regex = compile_pattern(pattern)
         except re.error as e:
             return f"Invalid regex pattern: {e}"
         
-        matches: list[GrepMatch] = []
+        return list(self.grep_compiled(regex, path, glob))
+    
+    def grep_compiled(
+        self,
+        regex: re.Pattern[str],
+        path: Optional[str] = None,
+        glob: Optional[str] = None
+    ) -> Iterator[GrepMatch]:
+        """Search for a compiled pattern in files, yielding matches."""
+        search = regex.search
         
         for file_path, content in self._files.items():
             # Filter by path
@@ -115,14 +125,12 @@ class StateBackend(BackendProtocol):
             
             # Search in content
             for line_num, line in enumerate(content.splitlines(), start=1):
-                if regex.search(line):
-                    matches.append(GrepMatch(
+                if search(line):
+                    yield GrepMatch(
                         path=file_path,
                         line=line_num,
                         text=line
-                    ))
-        
-        return matches
+                    )
     
     def glob_info(self, pattern: str, path: str = "/") -> list[FileInfo]:
         """Find files matching glob pattern."""
@@ -7,13 +7,14 @@ and persist across sessions and threads. Uses LangGraph BaseStore interface.
 Use case: Long-term memories, persistent knowledge, cross-session data.
 """
 
+from collections.abc import Iterator
 from datetime import datetime
 from typing import Optional
 import re
 from fnmatch import fnmatch
 import json
 
-from .protocol import BackendProtocol, FileInfo, WriteResult, EditResult, GrepMatch
+from .protocol import BackendProtocol, FileInfo, WriteResult, EditResult, GrepMatch, compile_pattern
 
 
 class StoreBackend(BackendProtocol):
@@ -129,11 +130,20 @@ class StoreBackend(BackendProtocol):
     ) -> list[GrepMatch] | str:
         """Search for pattern in files."""
         try:
-            regex = re.compile(pattern)
+            regex = compile_pattern(pattern)
         except re.error as e:
             return f"Invalid regex pattern: {e}"
         
-        matches: list[GrepMatch] = []
+        return list(self.grep_compiled(regex, path, glob))
+    
+    def grep_compiled(
+        self,
+        regex: re.Pattern[str],
+        path: Optional[str] = None,
+        glob: Optional[str] = None
+    ) -> Iterator[GrepMatch]:
+        """Search for a compiled pattern in files, yielding matches."""
+        search = regex.search
         
         for file_path, metadata in self._list_all_files():
             # Filter by path
@@ -147,14 +157,12 @@ class StoreBackend(BackendProtocol):
             # Search in content
             content = metadata["content"]
             for line_num, line in enumerate(content.splitlines(), start=1):
-                if regex.search(line):
-                    matches.append(GrepMatch(
+                if search(line):
+                    yield GrepMatch(
                         path=file_path,
                         line=line_num,
                         text=line
-                    ))
-        
-        return matches
+                    )
     
     def glob_info(self, pattern: str, path: str = "/") -> list[FileInfo]:
         """Find files matching glob pattern."""
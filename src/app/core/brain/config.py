@@ -13,11 +13,32 @@ Security Model:
 """
 
 import os
-import json
 import hashlib
 import re
 from typing import Tuple, Dict
 
+import orjson
+
+# Sorted keys + compact separators; non-str keys are stringified like json.dumps
+_CANONICAL_OPTS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+
+# Digest for args_hash / approval binding tags. These are integrity tags
+# compared in-process, not external identifiers, so the faster SIMD BLAKE3 is
+# the default; PHY_HASH=sha256 restores hashlib. Both yield 32 bytes.
+# Changing it invalidates approvals pending in existing checkpoints.
+HASH_ALG = os.getenv("PHY_HASH", "blake3").lower()
+
+if HASH_ALG == "blake3":
+    from blake3 import blake3 as _blake3
+
+    def _digest(data: bytes) -> bytes:
+        return _blake3(data).digest(length=32)
+elif HASH_ALG == "sha256":
+    def _digest(data: bytes) -> bytes:
+        return hashlib.sha256(data).digest()
+else:
+    raise ValueError(f"Unsupported PHY_HASH: {HASH_ALG!r} (expected 'blake3' or 'sha256')")
+
 def get_llm():
     """
     Factory function to create LLM instance with environment-based config.
@@ -55,6 +76,22 @@ def get_llm():
     )
 
 
+def canonicalize_bytes(args: Dict[str, object]) -> bytes:
+    """
+    Canonicalize tool arguments as UTF-8 bytes.
+    
+    orjson serializes straight to bytes, so the result can be hashed
+    without an extra str -> bytes encode.
+    
+    Args:
+        args: Tool arguments dictionary
+    
+    Returns:
+        bytes: Canonical JSON
+    """
+    return orjson.dumps(args, option=_CANONICAL_OPTS)
+
+
 def canonicalize(args: Dict[str, object]) -> str:
     """
     Canonicalize tool arguments for hash calculation.
@@ -74,26 +111,32 @@ def canonicalize(args: Dict[str, object]) -> str:
         >>> canonicalize({"path": "file.txt", "mode": "r"})
         '{"mode":"r","path":"file.txt"}'
     """
-    return json.dumps(args, sort_keys=True, separators=(',', ':'))
+    return canonicalize_bytes(args).decode('utf-8')
 
 
-def calculate_hash(canonical: str) -> str:
+def calculate_hash(canonical: str | bytes) -> bytes:
     """
-    Calculate SHA256 hash of canonical args.
+    Calculate the HASH_ALG (BLAKE3 or SHA256) digest of canonical args.
+    
+    The raw 32-byte digest is kept internally (half the size of hex and a
+    plain memcmp to compare); convert with .hex() only at human-facing
+    boundaries.
     
     Args:
-        canonical: Canonical JSON string from canonicalize()
+        canonical: Canonical JSON from canonicalize() or canonicalize_bytes()
     
     Returns:
-        str: Hex digest (64 characters)
+        bytes: Raw digest (32 bytes)
     
     Example:
-        >>> canonical = canonicalize({"path": "test.txt"})
+        >>> canonical = canonicalize_bytes({"path": "test.txt"})
         >>> hash_val = calculate_hash(canonical)
         >>> len(hash_val)
-        64
+        32
     """
-    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+    if isinstance(canonical, str):
+        canonical = canonical.encode('utf-8')
+    return _digest(canonical)
 
 
 def validate_tool_args(name: str, args: Dict[str, object]) -> Tuple[bool, str]:
@@ -208,11 +251,18 @@ def get_pinecone_index_host():
     return os.getenv("PINECONE_INDEX_HOST")
 
 
+def use_local_embed() -> bool:
+    """Whether dense embeddings run in-process (USE_LOCAL_EMBED=1) instead of Pinecone Inference."""
+    return os.getenv("USE_LOCAL_EMBED", "0") == "1"
+
+
 # Export all for easy imports
 __all__ = [
     "get_llm",
     "canonicalize",
+    "canonicalize_bytes",
     "calculate_hash",
+    "HASH_ALG",
     "validate_tool_args",
     "get_pinecone_client"
 ]
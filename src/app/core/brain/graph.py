@@ -22,8 +22,8 @@ from .llm_nodes import (
 )
 
 # Phase 4 helpers & execution
-from .config import get_llm, canonicalize, calculate_hash, validate_tool_args
-from ..tools.mcp_runner import MCPToolRunner
+from .config import get_llm, canonicalize_bytes, calculate_hash, validate_tool_args
+from ..tools.mcp_runner import get_or_create_runner
 from ..tools.registry import get_tool_registry
 from ..tools.idempotency import get_idempotency_store, make_idempotency_key
 
@@ -44,9 +44,7 @@ def get_graph():
     if _llm is None:
         _llm = get_llm()
     
-    # 2. Setup MCP Runner
-    if _mcp_runner is None:
-        _mcp_runner = MCPToolRunner()
+    # 2. MCP runner comes from the process-wide cache on first tool call
     
     # 3. Populate Tool Registry (if runner initialized)
     registry = get_tool_registry()
@@ -56,7 +54,7 @@ def get_graph():
     executor = partial(
         executor_node_impl, 
         llm=_llm, 
-        canonicalize=canonicalize, 
+        canonicalize=canonicalize_bytes, 
         hash_fn=calculate_hash, 
         validate_fn=validate_tool_args
     )
@@ -76,7 +74,7 @@ def get_graph():
         id_key = make_idempotency_key(
             state.get("thread_id", "default"),
             tool.get("step_idx", 0),
-            tool.get("args_hash", "")
+            tool.get("args_hash", b"")
         )
         
         cached = id_store.get(id_key)
@@ -84,14 +82,16 @@ def get_graph():
             print(f"[IDEMPOTENCY] Cache hit for {id_key}")
             return {"last_tool_result": cached}
 
-        # Ensure MCP runner is initialized
-        if not _mcp_runner.initialized:
-            mcp_config = os.getenv("MCP_CONFIG_PATH", ".mcp/config.json")
-            await _mcp_runner.initialize(mcp_config)
-            # Populat registry after init
-            registry.register_from_mcp(_mcp_runner)
+        # Process-wide warm runner for this config (initialized once)
+        global _mcp_runner
+        mcp_config = os.getenv("MCP_CONFIG_PATH", ".mcp/config.json")
+        runner = await get_or_create_runner(mcp_config)
+        if runner is not _mcp_runner:
+            _mcp_runner = runner
+            # Populate registry after init
+            registry.register_from_mcp(runner)
         
-        result = await _mcp_runner.call(tool["name"], tool["args"])
+        result = await runner.call(tool["name"], tool["args"])
         
         # Prepare result
         tool_result = None
@@ -189,8 +189,8 @@ async def planner_node_impl(
 async def executor_node_impl(
     state: AgentState,
     llm,
-    canonicalize: Callable[[Dict[str, object]], str],
-    hash_fn: Callable[[str], str],
+    canonicalize: Callable[[Dict[str, object]], bytes],
+    hash_fn: Callable[[bytes], bytes],
     validate_fn: Callable[[str, Dict[str, object]], tuple]
 ) -> Command[Literal["RiskGate", "Finalizer", "Interpreter"]]:
     """
@@ -225,9 +225,14 @@ async def executor_node_impl(
     step_text = plan[step_idx]
     
     # Tool whitelist (Dynamic from Registry for Phase 4.5+)
-    from .registry import get_tool_registry
+    from ..tools.registry import get_tool_registry
     registry = get_tool_registry()
     allowed_tools = registry.list_tools()
+    # Summary tier only: full schemas are fetched on demand for validation
+    tool_lines = "\n".join(
+        f"- {t['name']}: {t['description']}" if t["description"] else f"- {t['name']}"
+        for t in registry.list_summaries()
+    )
     
     # Fallback for MVP if registry not yet populated in this process
     if not allowed_tools:
@@ -236,6 +241,7 @@ async def executor_node_impl(
             "ls", "glob", "grep", "stat",
             "send_email"
         ]
+        tool_lines = "\n".join(f"- {name}" for name in allowed_tools)
     
     # Prompt for tool selection
     system_prompt = SystemMessage(content=(
@@ -246,7 +252,7 @@ async def executor_node_impl(
         "- Use only allowed tools\n"
         "- Provide complete arguments\n"
         "- Prefer precise tools (e.g., grep before read_file for search)\n\n"
-        f"ALLOWED TOOLS: {allowed_tools}\n\n"
+        f"ALLOWED TOOLS:\n{tool_lines}\n\n"
         'FORMAT: {"name": "tool_name", "args": {...}}\n'
     ))
     
@@ -301,7 +307,7 @@ async def executor_node_impl(
     proposed_tool = {
         "name": name,
         "args": args,
-        "canonical_args": canonical,
+        "canonical_args": canonical.decode('utf-8'),
         "args_hash": args_hash,
         "tool_call_id": f"lc_{int(time.time() * 1000)}",
         "step_idx": step_idx,
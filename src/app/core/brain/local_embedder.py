@@ -0,0 +1,94 @@
+"""
+LocalDenseEmbedder: in-process multilingual-e5-large via onnxruntime.
+
+Replaces the Pinecone Inference round-trip for the dense half of hybrid
+search. The sparse model (pinecone-sparse-english-v0) stays remote.
+
+Model preparation (offline, once):
+    optimum-cli export onnx --model intfloat/multilingual-e5-large e5-large/
+    python -c "from src.app.core.brain.local_embedder import quantize_model; \
+        quantize_model('e5-large/model.onnx', 'e5-large-int8.onnx')"
+
+Environment Variables:
+- USE_LOCAL_EMBED: "1" routes dense embeddings through this module
+- LOCAL_EMBED_MODEL: Path to the ONNX model (default: e5-large-int8.onnx)
+- LOCAL_EMBED_TOKENIZER: tokenizer.json path or HF repo id
+  (default: intfloat/multilingual-e5-large)
+"""
+
+import os
+from typing import List, Literal
+
+import numpy as np
+
+# e5 is trained with these instruction prefixes; omitting them degrades recall
+_E5_PREFIX = {"passage": "passage: ", "query": "query: "}
+MAX_TOKENS = 512  # Matches Pinecone's truncate="END" window for e5-large
+
+
+class LocalDenseEmbedder:
+    """
+    Mean-pooled, L2-normalized e5 embeddings from an ONNX session.
+    Output matches Pinecone's multilingual-e5-large (1024 dims, cosine).
+    """
+
+    def __init__(self, model_path: str | None = None, tokenizer: str | None = None):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        model_path = model_path or os.getenv("LOCAL_EMBED_MODEL", "e5-large-int8.onnx")
+        tokenizer = tokenizer or os.getenv("LOCAL_EMBED_TOKENIZER", "intfloat/multilingual-e5-large")
+
+        sess_options = ort.SessionOptions()
+        sess_options.intra_op_num_threads = os.cpu_count() or 1
+        sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+        # CUDA when available, CPU otherwise (onnxruntime skips missing providers)
+        available = ort.get_available_providers()
+        providers = [p for p in ("CUDAExecutionProvider", "CPUExecutionProvider") if p in available]
+        self.session = ort.InferenceSession(model_path, sess_options=sess_options, providers=providers)
+        self._input_names = {i.name for i in self.session.get_inputs()}
+
+        if os.path.isfile(tokenizer):
+            self.tokenizer = Tokenizer.from_file(tokenizer)
+        else:
+            self.tokenizer = Tokenizer.from_pretrained(tokenizer)
+        self.tokenizer.enable_truncation(max_length=MAX_TOKENS)
+        self.tokenizer.enable_padding()
+
+    def embed(
+        self,
+        texts: List[str],
+        input_type: Literal["passage", "query"] = "passage"
+    ) -> np.ndarray:
+        """
+        Embeds a batch of texts in one session run.
+
+        Returns:
+            np.ndarray: float32, shape (N, 1024), unit-norm rows
+        """
+        prefix = _E5_PREFIX[input_type]
+        encodings = self.tokenizer.encode_batch([prefix + t for t in texts])
+
+        input_ids = np.asarray([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.asarray([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self._input_names:
+            feeds["token_type_ids"] = np.zeros_like(input_ids)
+
+        last_hidden = self.session.run(None, feeds)[0]
+
+        # Mean pooling over non-padding tokens, then L2 normalize
+        mask = attention_mask[..., None].astype(np.float32)
+        pooled = (last_hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+        return pooled.astype(np.float32, copy=False)
+
+
+def quantize_model(src_path: str, dst_path: str) -> None:
+    """Dynamic int8 quantization of an exported e5 ONNX model (~4x CPU throughput)."""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    quantize_dynamic(src_path, dst_path, weight_type=QuantType.QInt8)
+
+
+__all__ = ["LocalDenseEmbedder", "quantize_model"]
@@ -1,6 +1,6 @@
 import re
 import os
-import json
+import hmac
 import hashlib
 from typing import Literal
 
@@ -9,7 +9,8 @@ from langgraph.types import Command
 from langchain_core.messages import HumanMessage, AIMessage
 
 # Phylactery Core
-from .schemas import AgentState, ProposedTool, ToolResult
+from .schemas import AgentState, ProposedTool, ToolResult, json_encoder
+from .config import canonicalize_bytes, calculate_hash
 from ..security.engine import RiskEngine
 from ..security.auth import TokenManager
 from ..backends.state import StateBackend
@@ -35,12 +36,10 @@ def make_tool_result_failed(msg: str) -> ToolResult:
         "source_path": None
     }
 
-def canonicalize(args: Dict[str, object]) -> str:
-    """Produces the canonical JSON string for HMAC signing."""
-    return json.dumps(args, sort_keys=True, separators=(',', ':'))
-
-def calculate_hash(content: str) -> str:
-    return hashlib.sha256(content.encode()).hexdigest()
+def approval_payload(state: AgentState) -> str:
+    """Composite binding string for approval tokens: thread_id:user_id:approval_hash(hex)."""
+    app_hash = state.get("approval_hash") or b""
+    return f"{state.get('thread_id', '')}:{state.get('user_id', '')}:{app_hash.hex()}"
 
 def save_eviction(content: str, run_id: str) -> str:
     """Real disk write implementation with Path Traversal Protection."""
@@ -113,8 +112,9 @@ def risk_gate_node(state: AgentState) -> Command[Literal["Tools", "AwaitApproval
 
     # 1. Integrity Check (Recalculate)
     # Trust No One: We rebuild canonical args and hash from the raw dict
-    canonical = canonicalize(tool["args"])
-    computed_hash = calculate_hash(canonical)
+    canonical_raw = canonicalize_bytes(tool["args"])
+    canonical = canonical_raw.decode('utf-8')
+    computed_hash = calculate_hash(canonical_raw)
 
     if tool.get("canonical_args") != canonical:
          return Command(
@@ -122,7 +122,7 @@ def risk_gate_node(state: AgentState) -> Command[Literal["Tools", "AwaitApproval
              goto="Interpreter"
          )
          
-    if tool.get("args_hash") != computed_hash:
+    if not hmac.compare_digest(tool.get("args_hash") or b"", computed_hash):
          return Command(
              update={"last_tool_result": make_tool_result_failed("Integrity Error: Hash mismatch (Tampering detected)")},
              goto="Interpreter"
@@ -211,11 +211,7 @@ def approval_handler_node(state: AgentState) -> Command[Literal["Tools", "Superv
 
     # 3. Binding Check (Composite Payload)
     # Payload = thread_id:user_id:approval_hash
-    thread_id = state.get("thread_id", "")
-    user_id = state.get("user_id", "")
-    app_hash = state.get("approval_hash", "")
-    
-    expected_payload = f"{thread_id}:{user_id}:{app_hash}"
+    expected_payload = approval_payload(state)
     
     # Verify & Consume (ATOMIC - single method call)
     if not auth_manager.verify_and_consume(token, expected_payload):
@@ -244,7 +240,7 @@ def interpreter_node(state: AgentState) -> Command[Literal["Supervisor"]]:
     
     # --- EVICTION LOGIC ---
     raw_output = result["output"]
-    raw_str = json.dumps(raw_output) if isinstance(raw_output, (dict, list)) else str(raw_output)
+    raw_str = json_encoder.encode(raw_output).decode() if isinstance(raw_output, (dict, list)) else str(raw_output)
     original_size = len(raw_str)
     
     if original_size > 10_000:
@@ -288,12 +284,7 @@ def await_approval_node(state: AgentState):
     Just yields to allow graph interrupt/exit.
     """
     # GENERATE TOKEN FOR USER CONVENIENCE (Simulation)
-    thread_id = state.get("thread_id", "")
-    user_id = state.get("user_id", "")
-    app_hash = state.get("approval_hash", "")
-    payload = f"{thread_id}:{user_id}:{app_hash}"
-    
-    token = auth_manager.sign_payload(payload)
+    token = auth_manager.sign_payload(approval_payload(state))
     
     return {
         "messages": [AIMessage(content=f"🔒 AUTH REQUIRED: To approve, type: APROBAR {state['approval_id']} {token}")]
@@ -1,4 +1,5 @@
 from typing import TypedDict, Annotated, List, Dict, Optional, Union
+import msgspec
 from langchain_core.messages import BaseMessage
 from langgraph.graph.message import add_messages
 
@@ -12,7 +13,7 @@ class ProposedTool(TypedDict):
     name: str
     args: Dict[str, object]
     canonical_args: str  # For HMAC binding (normalized JSON string)
-    args_hash: str       # SHA256(canonical_args)
+    args_hash: bytes     # calculate_hash(canonical_args), raw 32-byte digest
     tool_call_id: str    # LangChain compatibility
     step_idx: int
     created_at: float
@@ -81,10 +82,16 @@ class AgentState(TypedDict):
     # Approval State (HITL)
     awaiting_approval: bool
     approval_id: Optional[str]
-    approval_hash: Optional[str]
+    approval_hash: Optional[bytes]   # Raw 32-byte digest (hex only at API boundaries)
     approval_expires_at: Optional[float]
 
     # Safety & Audit
     do_not_store: bool
     security_findings: List[SecurityFinding] # DLP flags
     audit_trail: List[AuditEntry]            # Immutable log replica
+
+# --- CODECS ---
+# Contracts stay TypedDicts (LangGraph reducers and nodes use the dict protocol);
+# msgspec serializes them natively in C. Build once, reuse per call.
+
+json_encoder = msgspec.json.Encoder()
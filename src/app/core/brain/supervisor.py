@@ -11,11 +11,21 @@ Flow:
     Supervisor → Executor → RiskGate → [Auth/Tools] → Interpreter → Supervisor (loop)
 """
 
+from dataclasses import dataclass
 from typing import Literal
 from langgraph.types import Command
 from .schemas import AgentState
 
 
+@dataclass(slots=True)
+class _SupervisorView:
+    """Per-tick snapshot of the state fields the supervisor branches on."""
+    step_idx: int
+    plan_len: int
+    status: str
+    tries_here: int
+
+
 def supervisor_node(state: AgentState) -> Command[Literal["Executor", "Finalizer"]]:
     """
     Supervisor: Orchestrate task execution with retry logic.
@@ -24,23 +34,23 @@ def supervisor_node(state: AgentState) -> Command[Literal["Executor", "Finalizer
     plan = state.get("plan", [])
     step_status = state.get("step_status", {})
     tries = state.get("tries", {})
+    view = _SupervisorView(
+        step_idx=step_idx,
+        plan_len=len(plan),
+        status=step_status.get(step_idx, "pending"),
+        tries_here=tries.get(step_idx, 0),
+    )
     
-    # Edge case: No plan
-    if not plan:
-        return Command(goto="Finalizer")
-    
-    # Edge case: Beyond plan
-    if step_idx >= len(plan):
+    # Edge case: No plan / beyond plan
+    if view.step_idx >= view.plan_len:
         return Command(goto="Finalizer")
     
-    current_status = step_status.get(step_idx, "pending")
-    
     # Case 1: Step completed successfully
-    if current_status == "done":
-        next_idx = step_idx + 1
+    if view.status == "done":
+        next_idx = view.step_idx + 1
         
         # Check if plan complete
-        if next_idx >= len(plan):
+        if next_idx >= view.plan_len:
             return Command(goto="Finalizer")
         
         # Advance to next step
@@ -50,17 +60,15 @@ def supervisor_node(state: AgentState) -> Command[Literal["Executor", "Finalizer
         )
     
     # Case 2: Step failed
-    if current_status == "failed":
-        current_tries = tries.get(step_idx, 0)
-        
+    if view.status == "failed":
         # Max retries exceeded
-        if current_tries >= 3:
+        if view.tries_here >= 3:
             return Command(
                 update={
                     "awaiting_user_input": True,
                     "question": (
-                        f"❌ **Paso {step_idx + 1} falló después de 3 intentos**\n\n"
-                        f"**Paso:** {plan[step_idx]}\n\n"
+                        f"❌ **Paso {view.step_idx + 1} falló después de 3 intentos**\n\n"
+                        f"**Paso:** {plan[view.step_idx]}\n\n"
                         "**Opciones:**\n"
                         "1. Reintenta el paso (responde 'REINTENTAR')\n"
                         "2. Omite el paso (responde 'OMITIR')\n"
@@ -73,9 +81,9 @@ def supervisor_node(state: AgentState) -> Command[Literal["Executor", "Finalizer
         # Retry step
         return Command(
             update={
-                "tries": {**tries, step_idx: current_tries + 1},
+                "tries": {**tries, view.step_idx: view.tries_here + 1},
                 # Reset step status to pending for retry
-                "step_status": {**step_status, step_idx: "pending"}
+                "step_status": {**step_status, view.step_idx: "pending"}
             },
             goto="Executor"
         )
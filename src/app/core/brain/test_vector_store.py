@@ -14,32 +14,41 @@ from src.app.core.brain.vector_store import VectorStoreManager
 
 class TestVectorStoreManager(unittest.TestCase):
     
-    def setUp(self):
-        # Patch dependencies in the config module to avoid network calls and ValueError
-        self.patcher_client = patch('src.app.core.brain.config.get_pinecone_client')
-        self.patcher_name = patch('src.app.core.brain.config.get_pinecone_index_name')
-        self.patcher_host = patch('src.app.core.brain.config.get_pinecone_index_host')
-        
-        self.mock_get_client = self.patcher_client.start()
-        self.mock_get_name = self.patcher_name.start()
-        self.mock_get_host = self.patcher_host.start()
+    @classmethod
+    def setUpClass(cls):
+        # Patch the names where vector_store looks them up, to avoid network
+        # calls and ValueError. Started once for the whole class.
+        cls.patcher_client = patch('src.app.core.brain.vector_store.get_pinecone_client')
+        cls.patcher_name = patch('src.app.core.brain.vector_store.get_pinecone_index_name')
+        cls.patcher_host = patch('src.app.core.brain.vector_store.get_pinecone_index_host')
+        
+        cls.mock_get_client = cls.patcher_client.start()
+        cls.mock_get_name = cls.patcher_name.start()
+        cls.mock_get_host = cls.patcher_host.start()
         
         # Mock Pinecone client and index
-        self.mock_pc = MagicMock()
-        self.mock_index = MagicMock()
-        self.mock_get_client.return_value = self.mock_pc
-        self.mock_get_name.return_value = "test-index"
-        self.mock_get_host.return_value = None # Start with name-based
+        cls.mock_pc = MagicMock()
+        cls.mock_index = MagicMock()
+        cls.mock_get_client.return_value = cls.mock_pc
+        cls.mock_get_name.return_value = "test-index"
+        cls.mock_get_host.return_value = None # Start with name-based
         
         # When self.pc.Index(...) is called, return the mock index
-        self.mock_pc.Index.return_value = self.mock_index
+        cls.mock_pc.Index.return_value = cls.mock_index
         
-        self.vm = VectorStoreManager(index_name="test-index")
+        cls.vm = VectorStoreManager(index_name="test-index")
 
-    def tearDown(self):
-        self.patcher_client.stop()
-        self.patcher_name.stop()
-        self.patcher_host.stop()
+    @classmethod
+    def tearDownClass(cls):
+        cls.patcher_client.stop()
+        cls.patcher_name.stop()
+        cls.patcher_host.stop()
+
+    def setUp(self):
+        # Shared mocks: clear recorded calls and queued responses between tests
+        self.mock_pc.reset_mock()
+        self.mock_index.reset_mock()
+        self.mock_pc.inference.embed.side_effect = None
 
     def test_upsert_memory(self):
         # Mock inference responses
@@ -3,8 +3,8 @@ VectorStoreManager: Core component for Phase 5.1.1.
 Handles Hybrid Search (Dense + Sparse) and memory persistence.
 """
 
-from typing import Dict, Optional, TypedDict
-from .config import get_pinecone_client, get_pinecone_index_name, get_pinecone_index_host
+from typing import Dict, List, Literal, Optional, TypedDict
+from .config import get_pinecone_client, get_pinecone_index_name, get_pinecone_index_host, use_local_embed
 
 class MemoryItem(TypedDict):
     """Contract for a single memory record."""
@@ -30,14 +30,31 @@ class VectorStoreManager:
         else:
             self.index = self.pc.Index(self.index_name)
         
-    def _generate_hybrid_vectors(self, texts: List[str]) -> List[Dict[str, List[float]]]:
-        # ... (same implementation for integrated inference)
-        # Using Pinecone Inference API to generate vectors
-        dense_response = self.pc.inference.embed(
+        # Latency Optimization: dense embeddings in-process (no HTTPS round-trip)
+        self.local = None
+        if use_local_embed():
+            from .local_embedder import LocalDenseEmbedder
+            self.local = LocalDenseEmbedder()
+        
+    def _embed_dense(
+        self,
+        texts: List[str],
+        input_type: Literal["passage", "query"]
+    ) -> List[List[float]]:
+        """Dense vectors from the local ONNX model when enabled, Pinecone Inference otherwise."""
+        if self.local is not None:
+            return self.local.embed(texts, input_type=input_type).tolist()
+        
+        response = self.pc.inference.embed(
             model="multilingual-e5-large",
             inputs=texts,
-            parameters={"input_type": "passage", "truncate": "END"}
+            parameters={"input_type": input_type, "truncate": "END"}
         )
+        return [d.values for d in response]
+        
+    def _generate_hybrid_vectors(self, texts: List[str]) -> List[Dict[str, List[float]]]:
+        # Dense: local or Pinecone Inference; Sparse: always Pinecone Inference
+        dense_vectors = self._embed_dense(texts, "passage")
         
         sparse_response = self.pc.inference.embed(
             model="pinecone-sparse-english-v0",
@@ -46,9 +63,9 @@ class VectorStoreManager:
         )
         
         results = []
-        for d, s in zip(dense_response, sparse_response):
+        for d, s in zip(dense_vectors, sparse_response):
             results.append({
-                "dense": d.values,
+                "dense": d,
                 "sparse": {
                     "indices": s.sparse_indices,
                     "values": s.sparse_values
@@ -139,11 +156,7 @@ class VectorStoreManager:
             List of results with metadata and scores.
         """
         # Generate query vectors
-        dense_q = self.pc.inference.embed(
-            model="multilingual-e5-large",
-            inputs=[query_text],
-            parameters={"input_type": "query", "truncate": "END"}
-        )[0]
+        dense_q = self._embed_dense([query_text], "query")[0]
         
         sparse_q = self.pc.inference.embed(
             model="pinecone-sparse-english-v0",
@@ -152,7 +165,7 @@ class VectorStoreManager:
         )[0]
         
         # Apply weighting
-        h_dense = [v * alpha for v in dense_q.values]
+        h_dense = [v * alpha for v in dense_q]
         h_sparse = {
             "indices": sparse_q.sparse_indices,
             "values": [v * (1 - alpha) for v in sparse_q.sparse_values]
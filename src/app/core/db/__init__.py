@@ -1,4 +1,8 @@
 from .database import engine, get_session, init_db, async_session_maker
-from .models import RunDB, EventDB, BudgetDB
+from .models import RunDB, EventDB, BudgetDB, SecurityLogDB, ns_to_datetime
+from .writer import event_queue, start_event_writer, stop_event_writer, is_event_writer_running
 
-__all__ = ["engine", "get_session", "init_db", "async_session_maker", "RunDB", "EventDB", "BudgetDB"]
+__all__ = [
+    "engine", "get_session", "init_db", "async_session_maker", "RunDB", "EventDB", "BudgetDB", "SecurityLogDB", "ns_to_datetime",
+    "event_queue", "start_event_writer", "stop_event_writer", "is_event_writer_running"
+]
@@ -1,4 +1,6 @@
 import os
+import msgspec
+from sqlalchemy import Connection, Integer, inspect, make_url, text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from sqlmodel import SQLModel
@@ -7,7 +9,47 @@ from typing import AsyncGenerator
 # Default to SQLite for Dev, allow Postgres for Prod
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./phylactery.db")
 
-engine = create_async_engine(DATABASE_URL, echo=False, future=True)
+# JSON columns (EventDB.data, SecurityLogDB.details) serialize via msgspec, not stdlib json
+_json_encoder = msgspec.json.Encoder()
+_json_decoder = msgspec.json.Decoder()
+
+def _json_serializer(value: object) -> str:
+    return _json_encoder.encode(value).decode()
+
+def _engine_options(url: str) -> tuple[str, dict[str, object]]:
+    """Dialect-specific engine tuning. SQLite (aiosqlite) keeps the defaults."""
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "postgresql":
+        return url, {}
+
+    # Bare postgresql:// defaults to the C-implemented asyncpg driver; an
+    # explicit driver (e.g. postgresql+psycopg) is kept as given
+    if parsed.drivername == "postgresql":
+        parsed = parsed.set(drivername="postgresql+asyncpg")
+    options: dict[str, object] = {
+        "pool_size": 20,
+        "max_overflow": 40,
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+    }
+    if parsed.get_driver_name() == "asyncpg":
+        options["connect_args"] = {
+            "prepared_statement_cache_size": 512,
+            # Short OLTP queries: JIT compilation costs more than it saves
+            "server_settings": {"jit": "off"},
+        }
+    return parsed.render_as_string(hide_password=False), options
+
+_engine_url, _engine_kwargs = _engine_options(DATABASE_URL)
+
+engine = create_async_engine(
+    _engine_url,
+    echo=False,
+    future=True,
+    json_serializer=_json_serializer,
+    json_deserializer=_json_decoder.decode,
+    **_engine_kwargs,
+)
 
 async_session_maker = sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
@@ -19,6 +61,93 @@ async def init_db() -> None:
         # For production with millions of rows, use Alembic. 
         # For now, SQLModel's create_all is sufficient for the Spine MVP.
         await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.run_sync(_add_missing_columns)
+        await conn.run_sync(_migrate_epoch_ns)
+        await conn.run_sync(_sync_indexes)
+
+def _add_missing_columns(conn: Connection) -> None:
+    """
+    Adds columns introduced after a table was created (create_all skips
+    existing tables). Must run before _sync_indexes, which may index them.
+    """
+    existing_tables = set(inspect(conn).get_table_names())
+    quote = conn.dialect.identifier_preparer.quote
+    for table in SQLModel.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing = {c["name"] for c in inspect(conn).get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            if not column.nullable:
+                raise RuntimeError(
+                    f"Column {table.name}.{column.name} is NOT NULL and cannot be "
+                    "added automatically; migrate this database manually."
+                )
+            conn.execute(text(
+                f"ALTER TABLE {quote(table.name)} ADD COLUMN {quote(column.name)} "
+                f"{column.type.compile(dialect=conn.dialect)}"
+            ))
+
+# DATETIME columns of the original schema, now epoch-ns BIGINT (time.time_ns)
+_EPOCH_NS_COLUMNS = {
+    "runs": ("created_at", "updated_at"),
+    "events": ("timestamp",),
+    "budgets": ("last_updated",),
+    "security_logs": ("timestamp",),
+}
+# PRAGMA user_version once SQLite timestamp values have been converted
+_SQLITE_EPOCH_NS_VERSION = 1
+
+def _migrate_epoch_ns(conn: Connection) -> None:
+    """
+    Converts naive-UTC datetime values written by the original schema to
+    epoch nanoseconds, in place. Idempotent; a no-op on fresh databases.
+    """
+    tables = set(inspect(conn).get_table_names())
+    quote = conn.dialect.identifier_preparer.quote
+
+    if conn.dialect.name == "sqlite":
+        # Column types are advisory in SQLite: rewrite the text values and
+        # record the conversion so later startups skip the table scans.
+        if conn.execute(text("PRAGMA user_version")).scalar() >= _SQLITE_EPOCH_NS_VERSION:
+            return
+        for table, columns in _EPOCH_NS_COLUMNS.items():
+            if table not in tables:
+                continue
+            for column in map(quote, columns):
+                # strftime('%f') is SS.SSS: millisecond precision survives
+                conn.execute(text(
+                    f"UPDATE {quote(table)} SET {column} = "
+                    f"CAST(strftime('%s', {column}) AS INTEGER) * 1000000000 + "
+                    f"CAST(substr(strftime('%f', {column}), 4) AS INTEGER) * 1000000 "
+                    f"WHERE typeof({column}) = 'text'"
+                ))
+        conn.execute(text(f"PRAGMA user_version = {_SQLITE_EPOCH_NS_VERSION}"))
+        return
+
+    for table, columns in _EPOCH_NS_COLUMNS.items():
+        if table not in tables:
+            continue
+        types = {c["name"]: c["type"] for c in inspect(conn).get_columns(table)}
+        for column in columns:
+            if column in types and not isinstance(types[column], Integer):
+                # EXTRACT(EPOCH) reads a timestamp without time zone as UTC
+                conn.execute(text(
+                    f"ALTER TABLE {quote(table)} ALTER COLUMN {quote(column)} TYPE BIGINT "
+                    f"USING (EXTRACT(EPOCH FROM {quote(column)}) * 1000000000)::bigint"
+                ))
+
+def _sync_indexes(conn: Connection) -> None:
+    """
+    Minimal index migration for databases created by an older schema.
+    create_all skips existing tables (and therefore their new indexes).
+    """
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+    # Superseded by the (owner_id, status, updated_at) composite prefix
+    conn.execute(text("DROP INDEX IF EXISTS ix_runs_owner_id"))
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     """Dependency for providing an async session."""
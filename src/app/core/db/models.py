@@ -1,9 +1,39 @@
-from datetime import datetime
+import time
+from datetime import datetime, timezone
 from typing import Optional, List, Dict
+from sqlalchemy import BigInteger, Index, desc
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.types import TypeDecorator
 from sqlmodel import SQLModel, Field, Relationship, Column, JSON
 from enum import Enum
 import uuid
 
+# Timestamps are stored as epoch nanoseconds (time.time_ns) in BIGINT columns:
+# no datetime allocation per row and integer compares for ORDER BY.
+# Convert with ns_to_datetime() at the API boundary only.
+
+def ns_to_datetime(ns: int) -> datetime:
+    """Converts an epoch-ns column value to an aware UTC datetime."""
+    seconds, remainder = divmod(ns, 1_000_000_000)
+    return datetime.fromtimestamp(seconds, tz=timezone.utc).replace(microsecond=remainder // 1000)
+
+class FastJSONB(TypeDecorator):
+    """
+    JSON payload column: JSONB on Postgres, JSON elsewhere.
+
+    Encoding/decoding is done by the engine's msgspec json_serializer /
+    json_deserializer (see database.py), which SQLAlchemy's JSON types and
+    the asyncpg codecs already call, so no process_bind_param here — that
+    would serialize twice.
+    """
+    impl = JSON
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(JSONB())
+        return dialect.type_descriptor(JSON())
+
 class RunStatus(str, Enum):
     PENDING = "pending"
     RUNNING = "running"
@@ -23,16 +53,21 @@ class EventType(str, Enum):
 class RunDB(SQLModel, table=True):
     """Execution record for an agent run."""
     __tablename__ = "runs"
+    __table_args__ = (
+        # Hot listing query: "runs for owner X in status Y, newest first".
+        # owner_id is the index prefix, so it no longer needs its own index.
+        Index("ix_runs_owner_status_updated", "owner_id", "status", desc("updated_at")),
+    )
     
     id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
     agent_name: str = Field(index=True)
     status: RunStatus = Field(default=RunStatus.PENDING)
-    owner_id: str = Field(index=True)
+    owner_id: str
     thread_id: Optional[str] = Field(default=None, index=True)
     idempotency_key: Optional[str] = Field(default=None, index=True)
     
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: int = Field(default_factory=time.time_ns, sa_column=Column(BigInteger, nullable=False))
+    updated_at: int = Field(default_factory=time.time_ns, sa_column=Column(BigInteger, nullable=False))
     
     # Relationships
     events: List["EventDB"] = Relationship(back_populates="run", sa_relationship_kwargs={"cascade": "all, delete-orphan"})
@@ -44,10 +79,10 @@ class EventDB(SQLModel, table=True):
     id: int = Field(default=None, primary_key=True)
     run_id: str = Field(foreign_key="runs.id", index=True)
     event_type: EventType = Field(index=True)
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: int = Field(default_factory=time.time_ns, sa_column=Column(BigInteger, nullable=False, index=True))
     
     # Payload as JSON
-    data: Dict[str, object] = Field(default_factory=dict, sa_column=Column(JSON))
+    data: Dict[str, object] = Field(default_factory=dict, sa_column=Column(FastJSONB))
     
     # Relationships
     run: RunDB = Relationship(back_populates="events")
@@ -59,7 +94,7 @@ class BudgetDB(SQLModel, table=True):
     user_id: str = Field(primary_key=True)
     total_tokens: int = Field(default=0)
     total_runs: int = Field(default=0)
-    last_updated: datetime = Field(default_factory=datetime.utcnow)
+    last_updated: int = Field(default_factory=time.time_ns, sa_column=Column(BigInteger, nullable=False))
     
     # Quota configuration
     token_limit: int = Field(default=100000) # Default 100k tokens
@@ -69,11 +104,20 @@ class SecurityLogDB(SQLModel, table=True):
     __tablename__ = "security_logs"
     
     id: int = Field(default=None, primary_key=True)
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: int = Field(default_factory=time.time_ns, sa_column=Column(BigInteger, nullable=False))
     user_id: str = Field(index=True)
     category: str = Field(index=True) # e.g., "DLP", "INTENT", "AUTH"
     severity: str = Field(default="INFO")
     
     # Context as JSON
-    details: Dict[str, object] = Field(default_factory=dict, sa_column=Column(JSON))
+    details: Dict[str, object] = Field(default_factory=dict, sa_column=Column(FastJSONB))
     client_ip: Optional[str] = None
+
+    # JSONL hash chain this row belongs to (AuditLogger.chain) and its link
+    audit_chain: Optional[str] = None
+    integrity_hash: Optional[str] = None
+
+    __table_args__ = (
+        # Chain head lookup: WHERE audit_chain = ? ORDER BY id DESC LIMIT 1
+        Index("ix_security_logs_chain_id", "audit_chain", desc("id")),
+    )
@@ -0,0 +1,63 @@
+import unittest
+import tempfile
+import os
+from unittest import mock
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
+
+from src.app.core.db import writer
+from src.app.core.db.models import EventDB, EventType, RunDB
+
+
+class TestEventWriter(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        # Throwaway SQLite file with foreign keys enforced (as Postgres does)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        path = os.path.join(self.tmpdir.name, "events.db")
+        self.engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+
+        @event.listens_for(self.engine.sync_engine, "connect")
+        def _enable_fks(dbapi_conn, _):
+            dbapi_conn.execute("PRAGMA foreign_keys=ON")
+
+        async with self.engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        self.session_maker = sessionmaker(self.engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def asyncTearDown(self):
+        await self.engine.dispose()
+        self.tmpdir.cleanup()
+
+    # --- One bad row must not drop the rest of its batch ---
+    async def test_bad_event_only_drops_itself(self):
+        async with self.session_maker() as session:
+            session.add(RunDB(id="run-ok", agent_name="a", owner_id="u"))
+            await session.commit()
+
+        batch = [
+            EventDB(run_id="run-ok", event_type=EventType.MESSAGE_DELTA, data={"i": i})
+            for i in range(10)
+        ]
+        # Run that does not exist: violates the events.run_id foreign key
+        batch.insert(4, EventDB(run_id="run-missing", event_type=EventType.FINAL))
+
+        with mock.patch.object(writer, "async_session_maker", self.session_maker):
+            with self.assertLogs(writer.logger, level="ERROR") as logs:
+                await writer._flush_or_split(batch)
+
+        async with self.session_maker() as session:
+            rows = (await session.execute(select(EventDB).order_by(EventDB.id))).scalars().all()
+
+        self.assertEqual([row.data["i"] for row in rows], list(range(10)))
+        self.assertTrue(all(row.run_id == "run-ok" for row in rows))
+        dropped = [line for line in logs.output if "Dropping" in line]
+        self.assertEqual(len(dropped), 1)
+        self.assertIn("run-missing", dropped[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+"""
+Coalescing background writer for EventDB.
+
+Streaming runs (MESSAGE_DELTA) can emit hundreds of events per second; one
+session + commit per event saturates the write path. Producers put events on
+`event_queue` and a single writer task flushes them in batches every
+FLUSH_INTERVAL seconds or BATCH_SIZE rows, whichever comes first.
+
+A single consumer drains the FIFO, so per-run event order is preserved.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from sqlalchemy import update
+
+from .database import async_session_maker
+from .models import EventDB, RunDB
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = 0.05  # 50 ms
+BATCH_SIZE = 500
+
+# Bounded for backpressure: producers wait when the writer falls behind
+event_queue: asyncio.Queue[EventDB] = asyncio.Queue(maxsize=10_000)
+
+_writer_task: Optional[asyncio.Task] = None
+
+
+def is_event_writer_running() -> bool:
+    """True when a writer task is consuming event_queue."""
+    return _writer_task is not None and not _writer_task.done()
+
+
+async def start_event_writer() -> None:
+    """Start the background writer task (idempotent)."""
+    global _writer_task
+    if not is_event_writer_running():
+        _writer_task = asyncio.create_task(_writer_loop())
+
+
+async def stop_event_writer() -> None:
+    """Flush pending events, then stop the writer task."""
+    global _writer_task
+    if _writer_task is None:
+        return
+    if not _writer_task.done():
+        await event_queue.join()
+    _writer_task.cancel()
+    try:
+        await _writer_task
+    except asyncio.CancelledError:
+        pass
+    _writer_task = None
+
+
+async def _writer_loop() -> None:
+    """Collect events into batches and flush each batch in one transaction."""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await event_queue.get()]
+        deadline = loop.time() + FLUSH_INTERVAL
+
+        while len(batch) < BATCH_SIZE:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(event_queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+
+        try:
+            await _flush_or_split(batch)
+        finally:
+            for _ in batch:
+                event_queue.task_done()
+
+
+async def _flush_or_split(batch: list[EventDB]) -> None:
+    """
+    Flush a batch; if it fails, bisect and retry the halves so only the
+    rows that fail on their own (e.g. a run_id whose run is gone) are
+    dropped, each with its own log line. Order within the batch is kept.
+    """
+    try:
+        await _flush(batch)
+    except Exception as e:
+        if len(batch) == 1:
+            event = batch[0]
+            logger.error(
+                "Dropping %s event for run %s: %s", event.event_type, event.run_id, e
+            )
+            return
+        logger.warning("Flush of %d events failed, retrying in halves: %s", len(batch), e)
+        mid = len(batch) // 2
+        await _flush_or_split(batch[:mid])
+        await _flush_or_split(batch[mid:])
+
+
+async def _flush(batch: list[EventDB]) -> None:
+    """Insert a batch of events and bump updated_at on their runs."""
+    run_ids = {event.run_id for event in batch}
+    async with async_session_maker() as session:
+        session.add_all(batch)
+        await session.execute(
+            update(RunDB)
+            .where(RunDB.id.in_(run_ids))
+            .values(updated_at=time.time_ns())
+        )
+        await session.commit()
@@ -1,25 +1,32 @@
+import asyncio
+import atexit
+import functools
+import hashlib
 import logging
 import os
 import json
 import time
 from pathlib import Path
-from typing import Annotated, TYPE_CHECKING, cast
+from typing import Annotated, TYPE_CHECKING, AsyncIterator, Iterable, cast
 from langgraph.graph.message import add_messages
 
 from dotenv import load_dotenv
 from langchain_core.language_models import BaseChatModel
-from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage, ToolMessage
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, HumanMessage, SystemMessage, ToolMessage
 from langchain_core.runnables import Runnable
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_ollama import ChatOllama
 from langchain_openai import ChatOpenAI
+from langgraph.cache.memory import InMemoryCache
 from langgraph.graph import END, StateGraph
+from langgraph.types import CachePolicy
 from typing_extensions import TypedDict
 
 from .models import Agent
 
 if TYPE_CHECKING:
     from langgraph.graph.graph import CompiledGraph
+    from mcp import StdioServerParameters
     from .mcp_client import MCPClient
 
 load_dotenv()
@@ -29,6 +36,136 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# Model selection is read once; (provider, model, temperature) keys the LLM cache
+OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3")
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+GEMINI_MODEL = "gemini-1.5-flash"
+
+_PROVIDER_DEFAULTS: dict[str, tuple[str, float]] = {
+    "ollama": (OLLAMA_MODEL, 0.1),
+    "openai": (OPENAI_MODEL, 0.2),
+    "gemini": (GEMINI_MODEL, 0.7),
+}
+
+# Instances created by _build_llm, closed at interpreter exit
+_built_llms: list[BaseChatModel] = []
+
+
+@functools.lru_cache(maxsize=None)
+def _build_llm(provider: str, model: str, temperature: float) -> BaseChatModel:
+    """
+    Creates the chat model for a provider; engines sharing provider+model
+    share one client (and its HTTP connection pool). API keys are read here
+    rather than passed in, so they never end up in the cache key.
+    """
+    llm: BaseChatModel
+    if provider == "ollama":
+        logger.info("Using Ollama model: %s", model)
+        llm = ChatOllama(model=model, temperature=temperature)
+    elif provider == "openai":
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise ValueError("OPENAI_API_KEY not found and provider is 'openai'")
+        logger.info("Using OpenAI model: %s", model)
+        llm = ChatOpenAI(model=model, api_key=api_key, temperature=temperature)  # type: ignore[arg-type]
+    else:
+        api_key = os.getenv("GEMINI_API_KEY")
+        if not api_key:
+            raise ValueError("GEMINI_API_KEY not found and provider is 'gemini'")
+        logger.info("Using Gemini model: %s", model)
+        llm = ChatGoogleGenerativeAI(
+            model=model, google_api_key=api_key, temperature=temperature
+        )
+    _built_llms.append(llm)
+    return llm
+
+
+def _llm_key(ai_provider: str | None) -> tuple[str, str, float]:
+    """Resolves an agent's provider override to its _build_llm arguments."""
+    provider = (ai_provider or os.getenv("AI_PROVIDER", "ollama") or "ollama").lower()
+    # Anything unknown falls back to Gemini
+    if provider not in _PROVIDER_DEFAULTS:
+        provider = "gemini"
+    model_name, temperature = _PROVIDER_DEFAULTS[provider]
+    return provider, model_name, temperature
+
+
+async def warm_up_llms(agents: Iterable[Agent], timeout: float = 30.0) -> None:
+    """
+    Sends one throwaway prompt per distinct provider+model so the TLS
+    handshake, auth and (Ollama) model load happen before the first real
+    request. Best effort: failures and timeouts are logged and ignored.
+    """
+    keys = {_llm_key(agent.ai_provider) for agent in agents}
+
+    async def ping(key: tuple[str, str, float]) -> None:
+        try:
+            llm = _build_llm(*key)
+            await asyncio.wait_for(llm.ainvoke([HumanMessage(content=".")]), timeout=timeout)
+            logger.info("🔥 Warmed up %s/%s", key[0], key[1])
+        except Exception as e:
+            logger.warning("⚠️ Warm-up failed for %s/%s: %s", key[0], key[1], e or type(e).__name__)
+
+    await asyncio.gather(*(ping(key) for key in keys))
+
+
+@atexit.register
+def _close_llm_clients() -> None:
+    """Closes the sync HTTP clients of cached LLMs (best effort)."""
+    for llm in _built_llms:
+        for attr in ("root_client", "_client"):
+            close = getattr(getattr(llm, attr, None), "close", None)
+            if callable(close):
+                try:
+                    close()
+                except Exception:
+                    pass
+    _built_llms.clear()
+    _build_llm.cache_clear()
+
+
+# Node-level cache TTL for the planner (see _planner_cache_key); 0 disables it
+AGENT_CACHE_TTL = int(os.getenv("AGENT_CACHE_TTL", "300"))
+
+
+def _planner_cache_key(state: "AgentState") -> str:
+    """
+    Cache key over exactly what the planner prompt reads: the last human
+    message (the task) and the completed steps as truncated in the prompt.
+    """
+    last_human_msg = next(
+        (m.content for m in reversed(state.get("messages", [])) if isinstance(m, HumanMessage)), ""
+    )
+    past_steps = [(desc, result[:100]) for desc, result in state.get("past_steps", [])]
+    h = hashlib.blake2b(digest_size=16)
+    h.update(json.dumps([str(last_human_msg), past_steps]).encode())
+    return h.hexdigest()
+
+
+# Static tail of the router prompt (intent rules + format + examples)
+_ROUTER_RULES = (
+    "\n\n"
+    "### YOUR TASK\n"
+    "Analyze the user's message and classify the intent:\n\n"
+    "**TASK** - If the user wants you to DO something (create, write, modify, delete, run, execute, build, generate, etc.)\n"
+    "**CONVERSATION** - If the user is asking a question, wants information, or is just chatting\n\n"
+    "### CRITICAL RULES\n"
+    "- Action verbs (crear, hacer, escribir, generar, ejecutar, etc.) = TASK\n"
+    "- Questions (cómo, qué, por qué, etc.) = CONVERSATION\n"
+    "- If unsure, default to TASK (better to try than refuse)\n\n"
+    "### RESPONSE FORMAT (STRICT JSON)\n"
+    "Return ONLY this JSON structure:\n"
+    "{\"intent\": \"task\", \"task_description\": \"what to do\"}\n"
+    "OR\n"
+    "{\"intent\": \"conversation\", \"response\": \"your answer\"}\n\n"
+    "### EXAMPLES\n"
+    "User: '¿Cómo hago un PR?' → {\"intent\": \"conversation\", \"response\": \"Para hacer un PR...\"}\n"
+    "User: 'Crea un archivo test.txt' → {\"intent\": \"task\", \"task_description\": \"Create file test.txt\"}\n"
+    "User: 'Haz una página web' → {\"intent\": \"task\", \"task_description\": \"Build a web page\"}\n"
+    "User: '¿Qué es Phylactery?' → {\"intent\": \"conversation\", \"response\": \"Phylactery es...\"}\n"
+)
+
+
 # Define State
 class AgentState(TypedDict):
     """The state of the agent graph."""
@@ -51,41 +188,34 @@ class AgentEngine:
 
     def __init__(self, agent: Agent) -> None:
         self.agent = agent
+        # Role + instructions are fixed for the engine's lifetime: build the
+        # (potentially large) router prompt header once, not per turn
+        self._router_header = (
+            "You are Phylactery, a conversational AI assistant for SkullRender.\n"
+            f"Role: {agent.role}\n"
+            f"Instructions: {agent.instructions}\n"
+        )
         self.history = []
         self.cwd = os.getcwd()
-        self.last_used = time.time()
+        self.last_used = time.monotonic()
         self.tools: list[dict[str, object]] = []
         self.mcp_clients: list["MCPClient"] = []
         self.tool_to_client: dict[str, "MCPClient"] = {}
+        # Pool references held by this engine (see mcp_client.get_or_create)
+        self._mcp_params: list["StdioServerParameters"] = []
+        # Set by aclose(); holders of a stale reference should fetch a new engine
+        self.closed = False
+        # Turns running in ainvoke/astream; a close defers releasing MCP clients
+        # until the last one finishes
+        self._in_flight = 0
 
         # Use agent-specific provider if set, otherwise use global env
-        env_provider = os.getenv("AI_PROVIDER", "ollama") or "ollama"
-        raw_provider = agent.ai_provider or env_provider
-        provider = raw_provider.lower()
+        provider, model_name, temperature = _llm_key(agent.ai_provider)
 
         logger.info(f"Initializing engine for agent: {agent.role} using provider: {provider}")
 
-        # Basic LLM initialization
-        llm: BaseChatModel
-        if provider == "ollama":
-            model_name = os.getenv("OLLAMA_MODEL", "llama3")
-            logger.info(f"Using Ollama model: {model_name}")
-            llm = ChatOllama(model=model_name, temperature=0.1)
-        elif provider == "openai":
-            api_key = os.getenv("OPENAI_API_KEY")
-            if not api_key:
-                raise ValueError("OPENAI_API_KEY not found and provider is 'openai'")
-            model_name = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
-            logger.info(f"Using OpenAI model: {model_name}")
-            llm = ChatOpenAI(model=model_name, api_key=api_key, temperature=0.2)  # type: ignore[arg-type]
-        else:
-            api_key = os.getenv("GEMINI_API_KEY")
-            if not api_key:
-                raise ValueError("GEMINI_API_KEY not found and provider is 'gemini'")
-            logger.info("Using Gemini model: gemini-1.5-flash")
-            llm = ChatGoogleGenerativeAI(
-                model="gemini-1.5-flash", google_api_key=api_key, temperature=0.7
-            )
+        # Shared per (provider, model, temperature)
+        llm = _build_llm(provider, model_name, temperature)
 
         # Dual LLM Architecture (Phase 6)
         self.llm_text = llm  # For Router, Planner, Finalizer (NO TOOLS)
@@ -127,7 +257,7 @@ class AgentEngine:
     async def _init_mcp_tools(self, servers: list[str]) -> None:
         """Initialize MCP clients and fetch tools."""
         from mcp import StdioServerParameters
-        from .mcp_client import MCPClient
+        from .mcp_client import get_or_create, release
 
         # Phase 6 Fix: Multi-server configuration
         SERVER_CONFIG = {
@@ -168,21 +298,27 @@ class AgentEngine:
                 command=config["command"],
                 args=args,
             )
-            client = MCPClient(params)
             try:
-                await client.connect()
+                client = await get_or_create(params)
+            except Exception as e:
+                logger.error(f"❌ Failed to connect to MCP Server {server_name}: {e}")
+                continue
+            try:
                 server_tools = await client.list_tools()
-                self.mcp_clients.append(client)
-                for t in server_tools:
-                    # Phase 6 Fix: Namespace tools to avoid collisions
-                    tool_name = f"{server_name}.{t['name']}"
-                    tool_dict = cast(dict[str, object], t)
-                    tool_dict["name"] = tool_name  # Rename for uniqueness
-                    self.tools.append(tool_dict)
-                    self.tool_to_client[tool_name] = client
-                logger.info(f"✅ Connected to MCP Server: {server_name} ({len(server_tools)} tools)")
             except Exception as e:
                 logger.error(f"❌ Failed to connect to MCP Server {server_name}: {e}")
+                await release(params)
+                continue
+            self.mcp_clients.append(client)
+            self._mcp_params.append(params)
+            for t in server_tools:
+                # Phase 6 Fix: Namespace tools to avoid collisions
+                tool_name = f"{server_name}.{t['name']}"
+                tool_dict = cast(dict[str, object], t)
+                tool_dict["name"] = tool_name  # Rename for uniqueness
+                self.tools.append(tool_dict)
+                self.tool_to_client[tool_name] = client
+            logger.info(f"✅ Connected to MCP Server: {server_name} ({len(server_tools)} tools)")
 
         if self.tools and isinstance(self.llm_exec, BaseChatModel):
             logger.info(f"🛠️ Binding {len(self.tools)} tools to Executor LLM.")
@@ -208,32 +344,9 @@ class AgentEngine:
                 for doc in relevant_docs:
                     skills_context += f"- {doc.metadata.get('name')}: {doc.page_content[:200]}...\n"
 
-            router_prompt = (
-                f"You are Phylactery, a conversational AI assistant for SkullRender.\n"
-                f"Role: {self.agent.role}\n"
-                f"Instructions: {self.agent.instructions}\n"
-                f"{skills_context}\n\n"
-                "### YOUR TASK\n"
-                "Analyze the user's message and classify the intent:\n\n"
-                "**TASK** - If the user wants you to DO something (create, write, modify, delete, run, execute, build, generate, etc.)\n"
-                "**CONVERSATION** - If the user is asking a question, wants information, or is just chatting\n\n"
-                "### CRITICAL RULES\n"
-                "- Action verbs (crear, hacer, escribir, generar, ejecutar, etc.) = TASK\n"
-                "- Questions (cómo, qué, por qué, etc.) = CONVERSATION\n"
-                "- If unsure, default to TASK (better to try than refuse)\n\n"
-                "### RESPONSE FORMAT (STRICT JSON)\n"
-                "Return ONLY this JSON structure:\n"
-                "{\"intent\": \"task\", \"task_description\": \"what to do\"}\n"
-                "OR\n"
-                "{\"intent\": \"conversation\", \"response\": \"your answer\"}\n\n"
-                "### EXAMPLES\n"
-                "User: '¿Cómo hago un PR?' → {\"intent\": \"conversation\", \"response\": \"Para hacer un PR...\"}\n"
-                "User: 'Crea un archivo test.txt' → {\"intent\": \"task\", \"task_description\": \"Create file test.txt\"}\n"
-                "User: 'Haz una página web' → {\"intent\": \"task\", \"task_description\": \"Build a web page\"}\n"
-                "User: '¿Qué es Phylactery?' → {\"intent\": \"conversation\", \"response\": \"Phylactery es...\"}\n"
-            )
+            router_prompt = f"{self._router_header}{skills_context}{_ROUTER_RULES}"
 
-            response = await self.llm_text.ainvoke([SystemMessage(content=router_prompt)] + messages[-5:])
+            response = await self.llm_text.ainvoke([SystemMessage(content=router_prompt), *messages[-5:]])
             logger.info(f"🧠 Router raw response: {response.content[:200]}...")
             
             try:
@@ -381,10 +494,10 @@ class AgentEngine:
                     "Summarize the result and explain what changed. Mark the step as complete."
                 )
                 # Phase 6 CRITICAL FIX: Use llm_text (no tools) to prevent loops
-                response = await self.llm_text.ainvoke([system_prompt] + messages)
+                response = await self.llm_text.ainvoke([system_prompt, *messages])
             else:
                 # Normal execution with tools
-                response = await self.llm_exec.ainvoke([system_prompt] + messages)
+                response = await self.llm_exec.ainvoke([system_prompt, *messages])
             
             logger.info(f"Executor responded for step {step_idx}")
 
@@ -532,8 +645,14 @@ class AgentEngine:
                 "past_steps": past_steps
             }
 
+        # Same task + completed steps -> same plan: replay it. The router is not
+        # cached: it reads the recent history plus live RAG results.
+        cache_policy = (
+            CachePolicy(key_func=_planner_cache_key, ttl=AGENT_CACHE_TTL)
+            if AGENT_CACHE_TTL > 0 else None
+        )
         workflow.add_node("router", router)
-        workflow.add_node("planner", planner)
+        workflow.add_node("planner", planner, cache_policy=cache_policy)
         workflow.add_node("executor", executor)
         workflow.add_node("tools", call_tools)
         workflow.add_node("advance", advance_step)
@@ -566,17 +685,17 @@ class AgentEngine:
         workflow.add_edge("advance", "executor")
         workflow.add_edge("finalizer", END)  # Phase 6: Finalizer always ends
 
-        return workflow.compile()
+        return workflow.compile(cache=InMemoryCache() if cache_policy else None)
 
-    async def ainvoke(self, message: str) -> str:
-        """Runs the graph with a single user message, maintaining history."""
-        self.last_used = time.time()
+    def _start_turn(self, message: str) -> dict[str, object]:
+        """Records the user message and builds the graph inputs for this turn."""
+        self.last_used = time.monotonic()
         current_message = HumanMessage(content=message)
         self.history.append(current_message)
 
         # CRITICAL: Pass SANITIZED history to preserve AIMessage→ToolMessage relationships
         sanitized_history = self._sanitize_history(self.history)
-        inputs = {
+        return {
             "messages": sanitized_history,  # Phase 8 Fix: No orphaned tools!
             "intent": "",
             "plan": [],
@@ -584,9 +703,9 @@ class AgentEngine:
             "current_step": 0,
             "iteration_count": 0
         }
-        result = await self.graph.ainvoke(inputs)
 
-        # Update history with new messages from the run
+    def _finish_turn(self, result: dict[str, object]) -> str:
+        """Appends the run's new messages to history and returns the final answer."""
         new_msgs = [m for m in result["messages"] if m not in self.history]
         self.history.extend(new_msgs)
 
@@ -595,3 +714,74 @@ class AgentEngine:
             return str(ai_responses[-1].content)
 
         return "The spirits are silent."
+
+    async def ainvoke(self, message: str) -> str:
+        """Runs the graph with a single user message, maintaining history."""
+        self._in_flight += 1
+        try:
+            inputs = self._start_turn(message)
+            result = await self.graph.ainvoke(inputs)
+            return self._finish_turn(result)
+        finally:
+            await self._end_call()
+
+    async def astream(self, message: str) -> AsyncIterator[str]:
+        """
+        Like ainvoke, but yields the answer as text chunks.
+
+        Finalizer tokens are forwarded as the LLM produces them. Router replies
+        arrive as JSON, so a direct conversational answer is yielded whole.
+        """
+        self._in_flight += 1
+        try:
+            inputs = self._start_turn(message)
+            result: dict[str, object] = {}
+            streamed = False
+            async for mode, payload in self.graph.astream(inputs, stream_mode=["messages", "values"]):
+                if mode == "values":
+                    result = payload
+                    continue
+                chunk, metadata = payload
+                # Chunks only: the node's returned AIMessage is emitted here as well
+                if (
+                    isinstance(chunk, AIMessageChunk)
+                    and metadata.get("langgraph_node") == "finalizer"
+                    and chunk.content
+                ):
+                    streamed = True
+                    yield str(chunk.content)
+
+            answer = self._finish_turn(result) if result else "The spirits are silent."
+            if not streamed:
+                yield answer
+        finally:
+            await self._end_call()
+
+    async def _end_call(self) -> None:
+        """Ends one in-flight turn; the last one out of a closed engine releases it."""
+        self._in_flight -= 1
+        if self.closed and self._in_flight == 0:
+            await self._release_mcp_clients()
+
+    async def aclose(self) -> None:
+        """
+        Marks the engine closed and releases its pooled MCP clients (closed
+        when unused). With turns still running, the release waits for the
+        last of them, so their tool calls keep working.
+        """
+        self.closed = True
+        if self._in_flight == 0:
+            await self._release_mcp_clients()
+
+    async def _release_mcp_clients(self) -> None:
+        """Drops this engine's pool references (see mcp_client.release)."""
+        from .mcp_client import release
+
+        for params in self._mcp_params:
+            try:
+                await release(params)
+            except Exception as e:
+                logger.warning(f"⚠️ Error releasing MCP client: {e}")
+        self._mcp_params.clear()
+        self.mcp_clients.clear()
+        self.tool_to_client.clear()
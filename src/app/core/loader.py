@@ -1,10 +1,16 @@
 import logging
 import asyncio
+import mmap
+import os
+import re
 import time
+from collections import Counter, OrderedDict, defaultdict
+from collections.abc import Callable
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, TypeVar
 
 import frontmatter
+import yaml
 
 from .models import Agent, Skill
 from .memory import memory
@@ -14,62 +20,223 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Max concurrent file reads during load_brain (bounds open FDs / threads)
+LOAD_CONCURRENCY = 32
+
+# Max cached AgentEngines; least recently used is evicted beyond this
+MAX_ACTIVE_ENGINES = 64
+
+# "1" pings each distinct LLM in the background after load_brain
+AGENT_WARMUP = os.getenv("AGENT_WARMUP", "1") == "1"
+WARMUP_TIMEOUT = 30.0
+
+# libyaml-backed loader when available (PyYAML falls back to pure Python)
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Keyword tokens for skill matching: words of 4+ chars (unicode-aware)
+_TOKEN_RE = re.compile(r"\w{4,}")
+
+# UTF-8 BOM and blank space allowed before the opening '---' fence
+_LEADING_RE = re.compile(rb"(?:\xef\xbb\xbf)?\s*")
+
+T = TypeVar("T")
+
+
+def _tokenize(text: str) -> frozenset[str]:
+    return frozenset(_TOKEN_RE.findall(text.lower()))
+
+
+def _walk_agent_files(root: str):
+    """
+    Yields agent markdown paths under root, never descending into skills/.
+    
+    DirEntry carries the file type from the directory read, so no extra
+    stat call is needed per entry.
+    """
+    with os.scandir(root) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name == "skills":
+                    continue
+                yield from _walk_agent_files(entry.path)
+            elif entry.name.endswith(".md") and entry.name not in ("AGENTS.md", "README.md"):
+                yield entry.path
+
+
+def _fence_bounds(buf: bytes | mmap.mmap, pos: int = 0) -> tuple[int, int] | None:
+    """
+    Byte span of the YAML header between a '---' fence at pos and the next
+    one, or None when the buffer has no (closed) header.
+    """
+    if buf[pos:pos + 4] != b"---\n" and buf[pos:pos + 5] != b"---\r\n":
+        return None
+    start = buf.find(b"\n", pos) + 1
+    end = buf.find(b"\n---", start - 1)
+    if end == -1:
+        return None
+    return start, end + 1
+
+
+def _parse_frontmatter(raw: bytes) -> tuple[dict, str]:
+    """
+    Splits a markdown file into (metadata, body), same result as
+    frontmatter.load but parsed with the C YAML loader.
+    """
+    raw = raw[_LEADING_RE.match(raw).end():]
+    bounds = _fence_bounds(raw)
+    if bounds is None:
+        return {}, raw.decode("utf-8").strip()
+
+    start, end = bounds
+    meta = yaml.load(raw[start:end], Loader=_YAML_LOADER)
+    # Body starts on the line after the closing fence
+    body_start = raw.find(b"\n", end) + 1
+    body = raw[body_start:] if body_start else b""
+    return (meta if isinstance(meta, dict) else {}), body.decode("utf-8").strip()
+
+
+def _read_frontmatter(path: Path) -> tuple[dict, str]:
+    """Reads a markdown file and splits it with _parse_frontmatter."""
+    with open(path, "rb") as f:
+        return _parse_frontmatter(f.read())
+
+
+def _read_frontmatter_only(path: Path) -> dict:
+    """
+    Parses only the YAML header of a markdown file.
+    
+    The file is memory-mapped and sliced at the closing '---' fence, so the
+    body is never read or parsed. Returns {} when there is no header.
+    """
+    with open(path, "rb") as f:
+        if f.seek(0, 2) == 0:
+            return {}
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Same leading BOM/whitespace skip as _parse_frontmatter
+            bounds = _fence_bounds(mm, _LEADING_RE.match(mm).end())
+            if bounds is None:
+                return {}
+            header = mm[bounds[0]:bounds[1]]
+
+    meta = yaml.load(header, Loader=_YAML_LOADER)
+    return meta if isinstance(meta, dict) else {}
+
 
 class BrainLoader:
     def __init__(self, base_path: str = ".agent"):
         self.base_path = Path(base_path)
         self.agents: dict[str, Agent] = {}
         self.skills: dict[str, Skill] = {}
-        self.active_engines: dict[str, "AgentEngine"] = {}
+        # LRU order: oldest first, most recently used last
+        self.active_engines: OrderedDict[str, "AgentEngine"] = OrderedDict()
+        # Inverted index over skill descriptions: token -> skill names
+        self._inverted: dict[str, list[str]] = {}
+        self._io_limit = asyncio.Semaphore(LOAD_CONCURRENCY)
+        self._warmup_task: asyncio.Task | None = None
+        # Held while an engine is being built (see get_engine)
+        self._engine_locks: dict[str, asyncio.Lock] = {}
+        # (agent names, skill names) as of the last load; replaced, never mutated
+        self.loaded_names: tuple[tuple[str, ...], tuple[str, ...]] = ((), ())
 
     async def load_brain(self) -> None:
         """Reloads all agents and skills from the filesystem."""
-        self._load_skills()
-        self._load_agents()
-        logger.info(f"💀 Bones Loaded: {len(self.skills)} Skills, {len(self.agents)} Agents.")
+        await asyncio.gather(self._load_skills(), self._load_agents())
+        self.loaded_names = (tuple(self.agents), tuple(self.skills))
+        logger.info("💀 Bones Loaded: %d Skills, %d Agents.", len(self.skills), len(self.agents))
         
         # Trigger Memory Indexing
         if self.skills:
             logger.info("🧠 Syncing Short-term (RAM) to Long-term (Pinecone)...")
             await memory.index_skills(list(self.skills.values()))
 
+        # Fire-and-forget: first requests needn't pay the cold-start cost
+        if AGENT_WARMUP and self.agents:
+            from .engine import warm_up_llms
+            self._warmup_task = asyncio.create_task(
+                warm_up_llms(list(self.agents.values()), timeout=WARMUP_TIMEOUT)
+            )
+
     async def get_engine(self, agent_name: str) -> "AgentEngine":
         """Returns a cached engine or creates a new one."""
         from .engine import AgentEngine
 
         if agent_name in self.active_engines:
-            logger.info(f"✨ Invoking cached engine for {agent_name}")
+            logger.info("✨ Invoking cached engine for %s", agent_name)
+            self.active_engines.move_to_end(agent_name)
             return self.active_engines[agent_name]
 
         agent_def = self.get_agent(agent_name)
         if not agent_def:
             return None
 
-        logger.info(f"🧠 Initializing new engine for {agent_name}...")
-        engine = AgentEngine(agent_def)
-        # We handle async init here
-        if agent_def.mcp_servers:
-            await engine._init_mcp_tools(agent_def.mcp_servers)
+        # One builder per name: concurrent cold requests wait instead of
+        # each spawning their own MCP subprocesses
+        lock = self._engine_locks.setdefault(agent_name, asyncio.Lock())
+        async with lock:
+            if agent_name in self.active_engines:
+                self.active_engines.move_to_end(agent_name)
+                return self.active_engines[agent_name]
+
+            logger.info("🧠 Initializing new engine for %s...", agent_name)
+            engine = AgentEngine(agent_def)
+            # We handle async init here
+            if agent_def.mcp_servers:
+                await engine._init_mcp_tools(agent_def.mcp_servers)
+
+            self.active_engines[agent_name] = engine
+            # Cached now: later callers hit the fast path above
+            self._engine_locks.pop(agent_name, None)
 
-        self.active_engines[agent_name] = engine
+        if len(self.active_engines) > MAX_ACTIVE_ENGINES:
+            # Victim by last_used, not LRU order: sessions run turns on their
+            # own reference without going through get_engine (see
+            # prune_inactive_engines). Closed so its pooled MCP clients are
+            # released once its running turns finish (sessions holding it see
+            # engine.closed and fetch a fresh one)
+            evicted_name = min(
+                self.active_engines, key=lambda name: self.active_engines[name].last_used
+            )
+            evicted = self.active_engines.pop(evicted_name)
+            logger.info("🧹 Lich's Sweep: Evicting least recently used engine %s", evicted_name)
+            await evicted.aclose()
         return engine
 
-    def prune_inactive_engines(self, ttl_seconds: int = 300) -> None:
-        """Removes engines that haven't been used within the TTL."""
-        now = time.time()
-        to_delete = []
+    async def aclose_engines(self) -> None:
+        """Closes every cached engine (shutdown only: sessions may hold them)."""
+        if self._warmup_task and not self._warmup_task.done():
+            self._warmup_task.cancel()
+        while self.active_engines:
+            _, engine = self.active_engines.popitem(last=False)
+            await engine.aclose()
 
-        for name, engine in self.active_engines.items():
-            # Ensure the engine tracks its last used time
-            last_used = getattr(engine, "last_used", now)
-            if now - last_used > ttl_seconds:
-                to_delete.append(name)
+    async def prune_inactive_engines(self, ttl_seconds: int = 300) -> None:
+        """Removes and closes engines that haven't been used within the TTL."""
+        now = time.monotonic()
 
-        for name in to_delete:
-            logger.info(f"🧹 Lich's Sweep: Pruning inactive engine {name}")
-            del self.active_engines[name]
+        # Full scan (bounded by MAX_ACTIVE_ENGINES): sessions call ainvoke on
+        # their own engine reference, so last_used can be newer than LRU order.
+        expired = [
+            name for name, engine in self.active_engines.items()
+            if now - engine.last_used > ttl_seconds
+        ]
+        for name in expired:
+            logger.info("🧹 Lich's Sweep: Pruning inactive engine %s", name)
+            await self.active_engines.pop(name).aclose()
 
-    def _load_skills(self) -> None:
+    async def _read_all(self, paths: list[Path], reader: Callable[[Path], T]) -> list[T | BaseException]:
+        """
+        Runs a blocking file reader over paths off the event loop, concurrently.
+        
+        Results are in the same order as paths; a failed file yields its
+        exception instead of aborting the batch.
+        """
+        async def load_one(path: Path) -> T:
+            async with self._io_limit:
+                return await asyncio.to_thread(reader, path)
+
+        return await asyncio.gather(*(load_one(p) for p in paths), return_exceptions=True)
+
+    async def _load_skills(self) -> None:
         """
         Load skills with progressive disclosure.
         
@@ -80,27 +247,37 @@ class BrainLoader:
         if not skills_path.exists():
             return
 
-        # Walk through skill directories
-        for skill_dir in skills_path.iterdir():
-            if skill_dir.is_dir():
-                skill_file = skill_dir / "SKILL.md"
-                if skill_file.exists():
-                    try:
-                        post = frontmatter.load(skill_file)
-                        meta = post.metadata
-
-                        # Progressive Disclosure: Only load metadata initially
-                        skill = Skill(
-                            name=meta.get("name", skill_dir.name),
-                            description=meta.get("description", "No description"),
-                            version=meta.get("metadata", {}).get("version", "1.0.0"),
-                            tags=meta.get("metadata", {}).get("tags", []),
-                            content="",  # Empty initially, loaded on-demand
-                            path=str(skill_file),
-                        )
-                        self.skills[skill.name] = skill
-                    except Exception as e:
-                        logger.error(f"❌ Error loading skill {skill_file}: {e}")
+        # Collect skill files first, then read their headers concurrently
+        skill_files = [
+            d / "SKILL.md" for d in skills_path.iterdir()
+            if d.is_dir() and (d / "SKILL.md").exists()
+        ]
+        results = await self._read_all(skill_files, _read_frontmatter_only)
+
+        for skill_file, meta in zip(skill_files, results):
+            if isinstance(meta, BaseException):
+                logger.error("❌ Error loading skill %s: %s", skill_file, meta)
+                continue
+            try:
+                # Progressive Disclosure: Only load metadata initially
+                skill = Skill(
+                    name=meta.get("name", skill_file.parent.name),
+                    description=meta.get("description", "No description"),
+                    version=meta.get("metadata", {}).get("version", "1.0.0"),
+                    tags=tuple(meta.get("metadata", {}).get("tags") or ()),
+                    content="",  # Empty initially, loaded on-demand
+                    path=str(skill_file),
+                )
+                self.skills[skill.name] = skill
+            except Exception as e:
+                logger.error("❌ Error loading skill %s: %s", skill_file, e)
+
+        # Rebuilt from scratch so reloads don't duplicate postings
+        inverted: defaultdict[str, list[str]] = defaultdict(list)
+        for skill in self.skills.values():
+            for tok in _tokenize(skill.description):
+                inverted[tok].append(skill.name)
+        self._inverted = dict(inverted)
     
     def load_skill_content(self, skill_name: str) -> str:
         """
@@ -123,11 +300,13 @@ class BrainLoader:
         # Load full content from file
         try:
             post = frontmatter.load(skill.path)
-            skill.content = post.content
-            logger.info(f"📖 Loaded full content for skill: {skill_name}")
+            # Skill is frozen: swap in a copy carrying the body
+            skill = skill.model_copy(update={"content": post.content})
+            self.skills[skill_name] = skill
+            logger.info("📖 Loaded full content for skill: %s", skill_name)
             return skill.content
         except Exception as e:
-            logger.error(f"❌ Error loading skill content {skill.path}: {e}")
+            logger.error("❌ Error loading skill content %s: %s", skill.path, e)
             return ""
     
     def get_relevant_skills(self, query: str, max_skills: int = 3) -> list[Skill]:
@@ -141,59 +320,53 @@ class BrainLoader:
         Returns:
             List of relevant skills with full content loaded
         """
-        query_lower = query.lower()
-        relevant: list[tuple[Skill, int]] = []
+        query_tokens = _tokenize(query)
+        if not query_tokens:
+            return []
         
-        # Score skills by keyword matches in description
-        for skill in self.skills.values():
-            desc_lower = skill.description.lower()
-            score = 0
-            
-            # Simple keyword matching (can be improved with embeddings later)
-            for word in query_lower.split():
-                if len(word) > 3 and word in desc_lower:
-                    score += 1
-            
-            if score > 0:
-                relevant.append((skill, score))
+        # Score = keyword overlap, counted from posting lists so only skills
+        # sharing a token are touched (can be improved with embeddings later)
+        scores: Counter[str] = Counter()
+        for tok in query_tokens:
+            scores.update(self._inverted.get(tok, ()))
         
-        # Sort by score and take top N
-        relevant.sort(key=lambda x: x[1], reverse=True)
-        top_skills = [skill for skill, _ in relevant[:max_skills]]
+        top = scores.most_common(max_skills)
         
-        # Load full content for relevant skills
-        for skill in top_skills:
-            if not skill.content:
-                self.load_skill_content(skill.name)
+        # Load full content for relevant skills (replaces the cached Skill)
+        for name, _ in top:
+            if not self.skills[name].content:
+                self.load_skill_content(name)
         
-        return top_skills
+        return [self.skills[name] for name, _ in top]
 
 
-    def _load_agents(self) -> None:
+    async def _load_agents(self) -> None:
         # Phase 8 Fix: Recursive agent discovery (for architecture agents)
         # Scan everything except 'skills' folder
-        potential_agents = [
-            f for f in self.base_path.rglob("*.md")
-            if "skills" not in f.parts and f.name != "AGENTS.md" and f.name != "README.md"
-        ]
+        if not self.base_path.is_dir():
+            return
+        potential_agents = [Path(p) for p in _walk_agent_files(str(self.base_path))]
+        results = await self._read_all(potential_agents, _read_frontmatter)
 
-        for agent_file in potential_agents:
+        for agent_file, parsed in zip(potential_agents, results):
+            if isinstance(parsed, BaseException):
+                logger.error("❌ Error loading agent %s: %s", agent_file, parsed)
+                continue
             try:
-                post = frontmatter.load(agent_file)
-                meta = post.metadata
+                meta, body = parsed
 
                 agent = Agent(
                     name=agent_file.stem,
                     role=meta.get("role", "Assistant"),
                     description=meta.get("description", "No description"),
-                    instructions=post.content,
+                    instructions=body,
                     path=str(agent_file),
                     ai_provider=meta.get("ai_provider"),
                     mcp_servers=meta.get("mcp_servers", []),
                 )
                 self.agents[agent.name] = agent
             except Exception as e:
-                logger.error(f"❌ Error loading agent {agent_file}: {e}")
+                logger.error("❌ Error loading agent %s: %s", agent_file, e)
 
     def get_agent(self, name: str) -> Agent | None:
         return self.agents.get(name)
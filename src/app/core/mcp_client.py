@@ -1,11 +1,15 @@
+import asyncio
 import logging
-from contextlib import AsyncExitStack
+from collections.abc import AsyncIterator
+from contextlib import AsyncExitStack, asynccontextmanager
 from typing import TypedDict
 
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 from mcp.types import CallToolResult
 
+from .tools.mcp_runner import _connection_lost
+
 logger = logging.getLogger(__name__)
 
 
@@ -23,22 +27,82 @@ class MCPClient:
     def __init__(self, server_params: StdioServerParameters):
         self.server_params = server_params
         self.session: ClientSession | None = None
-        self._exit_stack: AsyncExitStack | None = None
+        # Pooled clients are connected by one request and closed by another
+        # task (release/shutdown); the stdio/session contexts must be exited by
+        # the task that entered them, so an owner task holds them.
+        self._owner: asyncio.Task | None = None
+        self._closing = asyncio.Event()
+        # Set when the server process dies; the next request reconnects
+        self._lost = False
+        self._reconnect_lock = asyncio.Lock()
 
     async def connect(self) -> None:
         """Connects to the MCP server."""
-        self._exit_stack = AsyncExitStack()
-        read, write = await self._exit_stack.enter_async_context(stdio_client(self.server_params))
-        self.session = await self._exit_stack.enter_async_context(ClientSession(read, write))
-        await self.session.initialize()
+        self._closing = asyncio.Event()
+        ready = asyncio.get_running_loop().create_future()
+        self._owner = asyncio.create_task(self._serve(ready))
+        try:
+            await ready
+        except BaseException:
+            await self.close()
+            raise
         logger.info("Connected to MCP Server")
 
-    async def list_tools(self) -> list[MCPTool]:
-        """Lists available tools from the server."""
+    async def _serve(self, ready: asyncio.Future) -> None:
+        """Opens the connection, then keeps it open until close()."""
+        try:
+            async with AsyncExitStack() as stack:
+                read, write = await stack.enter_async_context(stdio_client(self.server_params))
+                session = await stack.enter_async_context(ClientSession(read, write))
+                await session.initialize()
+                self.session = session
+                ready.set_result(None)
+                await self._closing.wait()
+        except BaseException as e:
+            if not ready.done():
+                ready.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+        finally:
+            self.session = None
+            # Contexts exited without close(): the transport went away
+            if not self._closing.is_set():
+                self._lost = True
+
+    async def _reconnect(self) -> None:
+        """Replaces a dead connection (once, however many callers noticed)."""
+        async with self._reconnect_lock:
+            if not self._lost:
+                return
+            logger.warning("Reconnecting to MCP server %s", self.server_params.command)
+            await self.close()
+            await self.connect()
+            self._lost = False
+
+    async def _live_session(self) -> ClientSession:
+        """The connected session, reconnecting first if the server died."""
+        if self._lost:
+            await self._reconnect()
         if not self.session:
             raise RuntimeError("Client not connected")
+        return self.session
+
+    @asynccontextmanager
+    async def _watch_transport(self) -> AsyncIterator[None]:
+        """Marks the client lost when a request fails because the server is gone."""
+        try:
+            yield
+        except Exception as e:
+            if _connection_lost(e):
+                logger.warning("MCP server connection lost: %s", e)
+                self._lost = True
+            raise
 
-        response = await self.session.list_tools()
+    async def list_tools(self) -> list[MCPTool]:
+        """Lists available tools from the server."""
+        session = await self._live_session()
+        async with self._watch_transport():
+            response = await session.list_tools()
         tools: list[MCPTool] = []
         for tool in response.tools:
             tools.append({
@@ -50,22 +114,102 @@ class MCPClient:
 
     async def call_tool(self, tool_name: str, arguments: dict[str, object]) -> str:
         """Calls a tool on the server."""
-        if not self.session:
-            raise RuntimeError("Client not connected")
-
-        result: CallToolResult = await self.session.call_tool(tool_name, arguments)
-
-        # Format the result content
-        output = []
-        if result.content:
-            for item in result.content:
-                if item.type == "text":
-                    output.append(item.text)
-                # Handle other content types if needed
-
-        return "\n".join(output) if output else "No output"
+        chunks = [chunk async for chunk in self.iter_tool_output(tool_name, arguments)]
+
+        # Format the result content (single text block is the common case: no copy)
+        if not chunks:
+            return "No output"
+        if len(chunks) == 1:
+            return chunks[0]
+        return "\n".join(chunks)
+
+    async def iter_tool_output(self, tool_name: str, arguments: dict[str, object]) -> AsyncIterator[str]:
+        """
+        Calls a tool and yields its text blocks one by one, so large outputs
+        can be piped elsewhere (e.g. to disk) without joining them first.
+        """
+        session = await self._live_session()
+        # Not retried: the tool may have run before the server died
+        async with self._watch_transport():
+            result: CallToolResult = await session.call_tool(tool_name, arguments)
+
+        for item in result.content or ():
+            if item.type != "text":
+                continue  # Handle other content types if needed
+            yield item.text
 
     async def close(self) -> None:
         """Closes the connection."""
-        if self._exit_stack:
-            await self._exit_stack.aclose()
+        owner, self._owner = self._owner, None
+        if owner is not None:
+            self._closing.set()
+            await asyncio.gather(owner, return_exceptions=True)
+
+
+# --- Shared client pool ---
+# One connected client (one server subprocess) per distinct server config,
+# shared by every engine that uses it and closed when the last one releases.
+_PoolKey = tuple[str, tuple[str, ...], tuple[tuple[str, str], ...]]
+
+_mcp_pool: dict[_PoolKey, MCPClient] = {}
+_mcp_refcounts: dict[_PoolKey, int] = {}
+_mcp_locks: dict[_PoolKey, asyncio.Lock] = {}
+
+
+def _pool_key(params: StdioServerParameters) -> _PoolKey:
+    return (params.command, tuple(params.args), tuple(sorted((params.env or {}).items())))
+
+
+@asynccontextmanager
+async def _pool_lock(key: _PoolKey) -> AsyncIterator[None]:
+    """Holds key's pool lock, re-acquiring if release() pruned it while we waited."""
+    while True:
+        lock = _mcp_locks.setdefault(key, asyncio.Lock())
+        await lock.acquire()
+        if _mcp_locks.get(key) is lock:
+            break
+        lock.release()
+    try:
+        yield
+    finally:
+        lock.release()
+
+
+async def get_or_create(params: StdioServerParameters) -> MCPClient:
+    """
+    Returns the pooled client for params, connecting it on first use.
+    
+    Each successful call takes a reference; pair it with release(params).
+    A pooled client whose server died is reconnected before it is handed
+    out. A failed connect raises and leaves nothing in the pool.
+    """
+    key = _pool_key(params)
+    async with _pool_lock(key):
+        client = _mcp_pool.get(key)
+        if client is None:
+            client = MCPClient(params)
+            try:
+                await client.connect()
+            except BaseException:
+                _mcp_locks.pop(key, None)
+                raise
+            _mcp_pool[key] = client
+        elif client._lost:
+            await client._reconnect()
+        _mcp_refcounts[key] = _mcp_refcounts.get(key, 0) + 1
+        return client
+
+
+async def release(params: StdioServerParameters) -> None:
+    """Drops one reference; the client (and its lock) go when none remain."""
+    key = _pool_key(params)
+    async with _pool_lock(key):
+        refs = _mcp_refcounts.get(key, 0) - 1
+        if refs > 0:
+            _mcp_refcounts[key] = refs
+            return
+        _mcp_refcounts.pop(key, None)
+        _mcp_locks.pop(key, None)
+        client = _mcp_pool.pop(key, None)
+    if client is not None:
+        await client.close()
@@ -1,5 +1,9 @@
+import asyncio
+import hashlib
+import json
 import logging
 import os
+from pathlib import Path
 from typing import Optional
 
 from dotenv import load_dotenv
@@ -15,6 +19,10 @@ from .models import Skill
 
 logger = logging.getLogger(__name__)
 
+# index_skills pipeline widths: embedding calls vs Pinecone upserts in flight
+EMBED_WORKERS = 2
+UPSERT_WORKERS = 4
+
 
 class VectorMemory:
     """Manages the long-term vector memory using Pinecone."""
@@ -25,6 +33,10 @@ class VectorMemory:
         self.embeddings = self._get_embeddings()
         self.vector_store: PineconeVectorStore | None = None
 
+        # {skill path: hash of the indexed record}; unchanged skills are not re-embedded
+        self.manifest_path = Path(os.getenv("INDEX_MANIFEST_PATH", ".agent/.index_manifest.json"))
+        self._hashes: dict[str, str] = self._load_manifest()
+
         if self.api_key:
             self._init_pinecone()
         else:
@@ -49,7 +61,7 @@ class VectorMemory:
             # Logic to create index is better handled in a setup script or carefully here
             existing_indexes = [i.name for i in pc.list_indexes()]
             if self.index_name not in existing_indexes:
-                logger.info(f"Creating new Pinecone index: {self.index_name}")
+                logger.info("Creating new Pinecone index: %s", self.index_name)
                 pc.create_index(
                     name=self.index_name,
                     dimension=1536 if isinstance(self.embeddings, OpenAIEmbeddings) else 768,
@@ -64,32 +76,158 @@ class VectorMemory:
             )
             logger.info("✅ Connected to Pinecone Memory.")
         except Exception as e:
-            logger.error(f"❌ Failed to initialize Pinecone: {e}")
+            logger.error("❌ Failed to initialize Pinecone: %s", e)
 
-    async def index_skills(self, skills: list[Skill]) -> None:
-        """Re-indexes all provided skills."""
+    def _load_manifest(self) -> dict[str, str]:
+        """Reads the index manifest; a missing or corrupt file means index everything."""
+        try:
+            with open(self.manifest_path, encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning("⚠️ Ignoring unreadable index manifest %s: %s", self.manifest_path, e)
+            return {}
+
+    def _save_manifest(self) -> None:
+        """Atomically replaces the manifest (write temp file, then os.replace)."""
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._hashes, f, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    @staticmethod
+    def skill_vector_id(path: str) -> str:
+        """Deterministic vector id per skill file, so re-indexing overwrites."""
+        return hashlib.blake2b(path.encode(), digest_size=8).hexdigest()
+
+    @staticmethod
+    def _record_hash(text: str, meta: dict[str, object]) -> str:
+        """Hash of everything written to the vector record (embedded text + metadata)."""
+        h = hashlib.blake2b(text.encode(), digest_size=16)
+        h.update(json.dumps(meta, sort_keys=True).encode())
+        return h.hexdigest()
+
+    async def index_skills(
+        self,
+        skills: list[Skill],
+        embeddings_chunk_size: int = 1000,
+        batch_size: int = 64,
+    ) -> None:
+        """
+        Re-indexes the provided skills whose content or metadata changed
+        since the last run, and deletes vectors of skills no longer present.
+        
+        Texts are embedded embeddings_chunk_size at a time; see
+        _embed_and_upsert for how embedding and upserts overlap.
+        """
         if not self.vector_store:
             return
 
-        documents = []
+        texts: list[str] = []
+        metadatas: list[dict[str, object]] = []
+        ids: list[str] = []
+        new_hashes: dict[str, str] = {}
         for skill in skills:
             # Metadata for filtering and context
-            meta = {
+            meta: dict[str, object] = {
                 "name": skill.name,
                 "version": skill.version,
-                "tags": ",".join(skill.tags),
+                "tags": skill.tag_str,
                 "path": skill.path
             }
+            record_hash = self._record_hash(skill.content, meta)
+            new_hashes[skill.path] = record_hash
+            if self._hashes.get(skill.path) == record_hash:
+                continue
+
             # Content is what we embed
-            doc = Document(page_content=skill.content, metadata=meta)
-            documents.append(doc)
+            texts.append(skill.content)
+            metadatas.append(meta)
+            ids.append(self.skill_vector_id(skill.path))
 
-        if documents:
-            logger.info(f"🧠 Encoding {len(documents)} skills into vector space...")
-            # Ideally delete old namespace or overwrite. For simplicity we add_documents
-            # PineconeVectorStore doesn't support 'overwrite' directly without logic
-            await self.vector_store.aadd_documents(documents)
-            logger.info("✨ Knowledge Indexing Complete.")
+        removed = [path for path in self._hashes if path not in new_hashes]
+        if not texts and not removed:
+            logger.info("✨ Knowledge index up to date.")
+            return
+
+        if texts:
+            logger.info("🧠 Encoding %d changed skills into vector space...", len(texts))
+            await self._embed_and_upsert(texts, metadatas, ids, embeddings_chunk_size, batch_size)
+        if removed:
+            logger.info("🧹 Removing %d deleted skills from vector space...", len(removed))
+            await self.vector_store.adelete(ids=[self.skill_vector_id(p) for p in removed])
+
+        # Only recorded after Pinecone accepted the writes
+        self._hashes = new_hashes
+        try:
+            self._save_manifest()
+        except OSError as e:
+            logger.warning("⚠️ Could not write index manifest %s: %s", self.manifest_path, e)
+        logger.info("✨ Knowledge Indexing Complete.")
+
+    async def _embed_and_upsert(
+        self,
+        texts: list[str],
+        metadatas: list[dict[str, object]],
+        ids: list[str],
+        chunk_size: int,
+        batch_size: int,
+    ) -> None:
+        """
+        Producer/consumer pipeline: chunks -> EMBED_WORKERS embedders ->
+        UPSERT_WORKERS upserters, so the next chunk is embedding while the
+        previous one is still in flight to Pinecone. Each upserter sends a
+        chunk's batches concurrently. Queues are bounded for backpressure and
+        shut down with None sentinels; any failure cancels the whole pipeline.
+        """
+        assert self.vector_store is not None
+        store = self.vector_store
+        chunks: asyncio.Queue[tuple[list[str], list[str], list[dict[str, object]]] | None] = asyncio.Queue(maxsize=4)
+        vectors: asyncio.Queue[list[tuple[str, list[float], dict[str, object]]] | None] = asyncio.Queue(maxsize=4)
+
+        async def produce() -> None:
+            for i in range(0, len(texts), chunk_size):
+                await chunks.put((ids[i:i + chunk_size], texts[i:i + chunk_size], metadatas[i:i + chunk_size]))
+            for _ in range(EMBED_WORKERS):
+                await chunks.put(None)
+
+        async def embed() -> None:
+            while (chunk := await chunks.get()) is not None:
+                chunk_ids, chunk_texts, chunk_metas = chunk
+                embedded = await self.embeddings.aembed_documents(chunk_texts)  # type: ignore[attr-defined]
+                # Same record layout as aadd_texts: the text rides in metadata
+                await vectors.put([
+                    (vid, vec, {**meta, "text": text})
+                    for vid, vec, meta, text in zip(chunk_ids, embedded, chunk_metas, chunk_texts)
+                ])
+
+        async def embed_all() -> None:
+            await asyncio.gather(*(embed() for _ in range(EMBED_WORKERS)))
+            for _ in range(UPSERT_WORKERS):
+                await vectors.put(None)
+
+        async def upsert(idx: object) -> None:
+            while (records := await vectors.get()) is not None:
+                await asyncio.gather(*(
+                    idx.upsert(vectors=records[j:j + batch_size])  # type: ignore[attr-defined]
+                    for j in range(0, len(records), batch_size)
+                ))
+
+        # Opening the store keeps one async index client for the whole run
+        async with store:
+            idx = await store.async_index
+            try:
+                async with asyncio.TaskGroup() as tg:
+                    tg.create_task(produce())
+                    tg.create_task(embed_all())
+                    for _ in range(UPSERT_WORKERS):
+                        tg.create_task(upsert(idx))
+            except ExceptionGroup as eg:
+                # Surface the first failure like aadd_texts used to
+                raise eg.exceptions[0] from None
 
     async def retrieve_relevant(self, query: str, k: int = 2) -> list[Document]:
         """Retrieves top-k relevant skills for a query."""
@@ -102,7 +240,7 @@ class VectorMemory:
             results = await self.vector_store.asimilarity_search(query, k=k)
             return cast(list[Document], results)
         except Exception as e:
-            logger.error(f"Error searching memory: {e}")
+            logger.error("Error searching memory: %s", e)
             return []
 
 # Singleton
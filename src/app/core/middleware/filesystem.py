@@ -12,10 +12,12 @@ Provides 6 filesystem tools to agents:
 Based on LangChain Deep Agents FilesystemMiddleware.
 """
 
+import io
+import re
 from typing import Optional, Callable
 from langchain_core.tools import tool
 
-from ..backends.protocol import BackendProtocol
+from ..backends.protocol import BackendProtocol, compile_pattern
 from ..backends.state import StateBackend
 
 
@@ -208,17 +210,21 @@ Files in /memories/ persist across sessions.
             Returns:
                 Matching lines with file paths and line numbers
             """
-            result = backend.grep_raw(pattern, path, glob_pattern)
-            if isinstance(result, str):
-                return f"Error: {result}"
+            try:
+                regex = compile_pattern(pattern)
+            except re.error as e:
+                return f"Error: Invalid regex pattern: {e}"
             
-            if not result:
-                return f"No matches found for pattern '{pattern}'"
+            # Stream matches straight into one buffer (no intermediate lists)
+            buf = io.StringIO()
+            w = buf.write
+            for match in backend.grep_compiled(regex, path, glob_pattern):
+                w(f"{match.path}:{match.line}: {match.text}\n")
             
-            lines = []
-            for match in result:
-                lines.append(f"{match.path}:{match.line}: {match.text}")
+            if not buf.tell():
+                return f"No matches found for pattern '{pattern}'"
             
-            return "\n".join(lines)
+            # Drop the trailing newline to match the previous join() output
+            return buf.getvalue()[:-1]
         
         return [ls, read_file, write_file, edit_file, glob, grep]
@@ -1,22 +1,34 @@
+from pydantic import BaseModel, ConfigDict, Field
 
-from pydantic import BaseModel
+# Immutable once loaded: update via model_copy(update=...)
+_MODEL_CONFIG = ConfigDict(frozen=True, extra="ignore")
 
 
 class Skill(BaseModel):
+    model_config = _MODEL_CONFIG
+
     name: str
     description: str
     version: str
-    tags: list[str]
+    tags: tuple[str, ...] = ()
     content: str
     path: str
 
+    # Comma-joined tags for vector metadata. Not cached: model_copy(update=...)
+    # would carry a cached value over stale tags.
+    @property
+    def tag_str(self) -> str:
+        return ",".join(self.tags)
+
 
 class Agent(BaseModel):
+    model_config = _MODEL_CONFIG
+
     name: str
     role: str
     description: str
-    skills: list[str] = []  # List of skill names referenced
+    skills: list[str] = Field(default_factory=list)  # List of skill names referenced
     instructions: str  # The system prompt body
     path: str
     ai_provider: str | None = None  # Optional: override global provider
-    mcp_servers: list[str] = []
+    mcp_servers: list[str] = Field(default_factory=list)
@@ -1,26 +1,53 @@
+import asyncio
 import json
 import time
 import os
+import weakref
 import hashlib
-from datetime import datetime
-from typing import Dict, Literal, TypedDict, Union, List, Optional
+from typing import BinaryIO, Dict, Literal, TypedDict, Union, List, Optional
+
+import orjson
+from sqlalchemy import select
 
 # Recursive JSON Type definition for better safety than Any
 JSONValue = Union[str, int, float, bool, None, Dict[str, 'JSONValue'], List['JSONValue']]
 
 AUDIT_FILE = "security_audit.jsonl"
+TAIL_BLOCK = 4096  # Bytes read per backwards step when locating the last record
+WRITE_BATCH = 256  # Max records per gathered write (stays under IOV_MAX)
+FSYNC_EVERY = 16   # sync to disk after this many batched writes
+
+# Chain hash. Records carry hash_alg so verifiers can tell it from the
+# older unversioned sha256 records.
+HASH_ALG = "blake2b"
+# Optional key making chain links authenticated, not just integrity. blake2b
+# takes at most 64 bytes, so a longer key is hashed down to 64 (as HMAC does)
+_CHAIN_KEY = os.getenv("AUDIT_CHAIN_KEY", "").encode()
+if len(_CHAIN_KEY) > hashlib.blake2b.MAX_KEY_SIZE:
+    _CHAIN_KEY = hashlib.blake2b(_CHAIN_KEY).digest()
 
 class AuditRecord(TypedDict):
+    # integrity_hash = blake2b-256(prev_hash + "|" + sorted-key compact JSON
+    # of every other field), keyed with AUDIT_CHAIN_KEY when set; it is
+    # always the last key on the line
     ts: float
     event: str
     details: Dict[str, JSONValue]
     decision: str
     risk: str
     prev_hash: str
+    hash_alg: str
     integrity_hash: str
 
 from ..db import async_session_maker, SecurityLogDB
 
+_HAS_WRITEV = hasattr(os, "writev")  # POSIX only
+# fdatasync is missing on macOS/Windows; fsync is the portable fallback
+_sync = getattr(os, "fdatasync", os.fsync)
+
+# Loggers with a running writer task, flushed by stop_audit_writers()
+_live_loggers: "weakref.WeakSet[AuditLogger]" = weakref.WeakSet()
+
 
 class AuditLogger:
     """
@@ -30,26 +57,147 @@ class AuditLogger:
     
     def __init__(self, log_path: str = AUDIT_FILE):
         self.log_path = log_path
-        self._last_hash = self._get_last_hash()
+        # Chain id stored on SQL rows, so loggers sharing the table don't mix
+        self.chain = os.path.basename(log_path)
+        # Resolved on first log_event (see _init_last_hash)
+        self._last_hash: Optional[str] = None
+        # Held from chaining through the SQL insert: row id order == chain order
+        self._chain_lock = asyncio.Lock()
+        # Lines are chained here, then appended in batches by _writer_loop
+        self._queue: asyncio.Queue[bytes] = asyncio.Queue()
+        self._writer: Optional[asyncio.Task] = None
+        self._fd: Optional[int] = None
+
+    async def start(self) -> None:
+        """Opens the log once and starts the batching writer (idempotent)."""
+        if self._writer is not None and not self._writer.done():
+            return
+        if self._fd is None:
+            self._fd = os.open(self.log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._writer = asyncio.create_task(self._writer_loop())
+        _live_loggers.add(self)
+
+    async def aclose(self) -> None:
+        """Flushes queued records to disk, then stops the writer and closes the file."""
+        if self._writer is not None:
+            if not self._writer.done():
+                await self._queue.join()
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
+            self._writer = None
+        if self._fd is not None:
+            try:
+                _sync(self._fd)
+            except OSError as e:
+                print(f"Error syncing audit log: {e}")
+            finally:
+                os.close(self._fd)
+                self._fd = None
+        _live_loggers.discard(self)
+
+    async def _writer_loop(self) -> None:
+        """Drains up to WRITE_BATCH lines per writev; syncs every FSYNC_EVERY writes."""
+        writes = 0
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < WRITE_BATCH and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                writes += 1
+                sync = writes % FSYNC_EVERY == 0
+                await asyncio.to_thread(self._append, batch, sync)
+            except Exception as e:
+                print(f"Error logging to JSONL: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _append(self, lines: list[bytes], sync: bool) -> None:
+        """
+        Appends lines with one gathered write (writev: no join copy) where
+        available; a short write falls back to os.write for the remainder.
+        """
+        assert self._fd is not None
+        if _HAS_WRITEV:
+            written = os.writev(self._fd, lines)
+            total = sum(map(len, lines))
+            if written == total:
+                if sync:
+                    _sync(self._fd)
+                return
+            view = memoryview(b"".join(lines))[written:]
+        else:
+            view = memoryview(b"".join(lines))
+        while view:
+            view = view[os.write(self._fd, view):]
+        if sync:
+            _sync(self._fd)
+
+    async def _init_last_hash(self) -> str:
+        """
+        Chain head to resume from. The JSONL file is the chained artifact, so
+        its tail wins: SQL can be ahead of it (queued lines lost in a crash)
+        or behind it (a failed insert). The last SQL row of this chain is
+        used only when the file is missing or its tail is unreadable.
+        """
+        tail = self._get_last_hash()
+        if os.path.exists(self.log_path) and tail != "ERROR_READING_LAST_HASH":
+            return tail
+        try:
+            async with async_session_maker() as session:
+                result = await session.execute(
+                    select(SecurityLogDB.integrity_hash)
+                    .where(SecurityLogDB.audit_chain == self.chain)
+                    .order_by(SecurityLogDB.id.desc())
+                    .limit(1)
+                )
+                head = result.scalar_one_or_none()
+            if head:
+                return head
+        except Exception as e:
+            print(f"Error reading last hash from SQL: {e}")
+        return tail
 
     def _get_last_hash(self) -> str:
-        """Reads the last line of the audit log to get the previous hash."""
+        """
+        Reads the last line of the audit log to get the previous hash.
+        Seeks backwards from EOF in TAIL_BLOCK chunks, so cost doesn't grow
+        with the log.
+        """
         if not os.path.exists(self.log_path):
             return "0" * 64 # Genesis hash
         
         try:
             with open(self.log_path, 'rb') as f:
                 try:
-                    lines = f.readlines()
-                    if not lines:
+                    last_line = self._read_last_line(f)
+                    if not last_line:
                         return "0" * 64
-                    last_line = json.loads(lines[-1].decode())
-                    return last_line.get("integrity_hash", "0" * 64)
+                    return json.loads(last_line).get("integrity_hash", "0" * 64)
                 except Exception:
                     return "ERROR_READING_LAST_HASH"
         except FileNotFoundError:
             return "0" * 64
 
+    @staticmethod
+    def _read_last_line(f: BinaryIO) -> bytes:
+        """Returns the last non-empty line of a binary file (b"" if none)."""
+        pos = os.fstat(f.fileno()).st_size
+        tail = b""
+        while pos > 0:
+            step = min(TAIL_BLOCK, pos)
+            pos -= step
+            f.seek(pos)
+            tail = f.read(step) + tail
+            # A newline before the (stripped) last line means it's complete
+            stripped = tail.rstrip(b"\r\n")
+            if b"\n" in stripped:
+                return stripped.rsplit(b"\n", 1)[1]
+        return tail.rstrip(b"\r\n")
+
     async def log_event(
         self, 
         event_type: str, 
@@ -61,49 +209,79 @@ class AuditLogger:
         """
         Appends a signed event to the log and the database.
         """
-        timestamp_float = time.time()
-        now = datetime.fromtimestamp(timestamp_float)
-        
-        # 1. SQL Persistence (Primary)
-        if user_id:
-            try:
-                async with async_session_maker() as session:
-                    log_db = SecurityLogDB(
-                        user_id=user_id,
-                        category=event_type,
-                        severity=risk_level,
-                        details={**details, "decision": decision},
-                        timestamp=now
-                    )
-                    session.add(log_db)
-                    await session.commit()
-            except Exception as e:
-                # Fallback: Just log it to JSONL if DB fails
-                print(f"Error logging to SQL: {e}")
+        async with self._chain_lock:
+            if self._last_hash is None:
+                self._last_hash = await self._init_last_hash()
+            await self._append_event(event_type, details, decision, risk_level, user_id)
 
-        # 2. JSONL Persistence (Redundant / Hardened)
-        # Construct record without hash first
-        record: AuditRecord = { # type: ignore
-            "ts": timestamp_float,
-            "event": event_type,
-            "details": details, 
-            "decision": decision, 
-            "risk": risk_level,
-            "prev_hash": self._last_hash,
-            "integrity_hash": "" # Placeholder
-        }
+    async def _append_event(
+        self,
+        event_type: str,
+        details: Dict[str, JSONValue],
+        decision: str,
+        risk_level: str,
+        user_id: Optional[str],
+    ) -> None:
+        """Chains one record, persists it to SQL, then queues the JSONL line."""
+        assert self._last_hash is not None
+        timestamp_ns = time.time_ns()
+        timestamp_float = timestamp_ns / 1_000_000_000
+
+        # Serialized once, canonically (sorted keys, compact); the hash covers
+        # prev_hash + body and is spliced onto the same bytes for the line.
+        body = orjson.dumps(
+            {
+                "ts": timestamp_float,
+                "event": event_type,
+                "details": details,
+                "decision": decision,
+                "risk": risk_level,
+                "prev_hash": self._last_hash,
+                "hash_alg": HASH_ALG,
+            },
+            option=orjson.OPT_SORT_KEYS,
+        )
         
         # Calculate new hash (Integrity Binding)
-        record_str = json.dumps(record, sort_keys=True)
-        new_hash = hashlib.sha256(record_str.encode()).hexdigest()
-        
-        record["integrity_hash"] = new_hash
-        
-        # Write to disk
+        h = hashlib.blake2b(self._last_hash.encode(), digest_size=32, key=_CHAIN_KEY)
+        h.update(b"|")
+        h.update(body)
+        new_hash = h.hexdigest()
+        line = b"".join((body[:-1], b',"integrity_hash":"', new_hash.encode(), b'"}\n'))
+
+        # 1. SQL Persistence (Primary)
+        # Every chained event gets a row, including ones without a user
+        # (recorded as "system"), so the SQL head matches the JSONL tail
+        # whenever the insert succeeds (_init_last_hash may fall back to it).
         try:
-            with open(self.log_path, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(record) + "\n")
-            # Update memory state
-            self._last_hash = new_hash
+            async with async_session_maker() as session:
+                log_db = SecurityLogDB(
+                    user_id=user_id or "system",
+                    category=event_type,
+                    severity=risk_level,
+                    details={**details, "decision": decision},
+                    timestamp=timestamp_ns,
+                    audit_chain=self.chain,
+                    integrity_hash=new_hash,
+                )
+                session.add(log_db)
+                await session.commit()
         except Exception as e:
-            print(f"Error logging to JSONL: {e}")
+            # Fallback: Just log it to JSONL if DB fails
+            print(f"Error logging to SQL: {e}")
+
+        # 2. JSONL Persistence (Redundant / Hardened)
+        # Chain advances at enqueue; _chain_lock keeps file order == chain order
+        self._last_hash = new_hash
+        self._queue.put_nowait(line)
+        if self._writer is None or self._writer.done():
+            try:
+                await self.start()
+            except OSError as e:
+                print(f"Error logging to JSONL: {e}")
+
+
+async def stop_audit_writers() -> None:
+    """Flush and close every started AuditLogger (call on shutdown)."""
+    for audit_logger in list(_live_loggers):
+        await audit_logger.aclose()
@@ -1,11 +1,15 @@
+import asyncio
+import heapq
 import hmac
-import hashlib
 import time
 import secrets
 import os
 import threading
 from typing import Optional
 
+# Without a running cleanup task, verify_and_consume prunes inline past this size
+CLEANUP_HIGH_WATER = 10_000
+
 class TokenManager:
     """
     HMAC-SHA256 Token Manager for Approval Workflows.
@@ -41,8 +45,36 @@ class TokenManager:
                 )
         
         self.secret = secret_key.encode()
-        self._used_tokens: dict[str, float] = {}  # token -> expiry_timestamp
+        # Raw 32-byte signature -> expiry_timestamp (the signature alone is
+        # unique per token, and short bytes hash faster than the token string)
+        self._used_tokens: dict[bytes, float] = {}
+        # (expiry, signature) min-heap: cleanup pops only what has expired.
+        # A heap rather than insertion order, since max_age_seconds can vary per call.
+        self._expiry_heap: list[tuple[float, bytes]] = []
         self._lock = threading.Lock()  # For atomic check-and-set in single process
+        self._cleanup_task: Optional[asyncio.Task] = None
+
+    async def start_cleanup(self, interval_seconds: float = 75):
+        """Start background expiry of consumed tokens (default: 300s max age / 4)."""
+        if self._cleanup_task is None:
+            self._cleanup_task = asyncio.create_task(self._cleanup_loop(interval_seconds))
+
+    async def stop_cleanup(self):
+        """Stop background cleanup task."""
+        if self._cleanup_task:
+            self._cleanup_task.cancel()
+            try:
+                await self._cleanup_task
+            except asyncio.CancelledError:
+                pass
+            self._cleanup_task = None
+
+    async def _cleanup_loop(self, interval_seconds: float):
+        """Background task to remove expired tokens."""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            with self._lock:
+                self._cleanup_expired_tokens()
         
     def sign_payload(self, payload: str) -> str:
         """
@@ -63,11 +95,17 @@ class TokenManager:
         nonce = secrets.token_hex(8)  # 16 chars of entropy
         
         # Canonical Message: timestamp:nonce:payload
-        msg = f"{timestamp}:{nonce}:{payload}".encode()
-        signature = hmac.new(self.secret, msg, hashlib.sha256).hexdigest()
+        msg = self._message(timestamp, nonce, payload)
+        # One-shot OpenSSL HMAC: no per-call HMAC object
+        signature = hmac.digest(self.secret, msg, "sha256").hex()
         
         return f"v1.{timestamp}.{nonce}.{signature}"
 
+    @staticmethod
+    def _message(timestamp: str, nonce: str, payload: str) -> bytes:
+        """Canonical signed bytes "timestamp:nonce:payload" (joined as bytes, no f-string)."""
+        return b":".join((timestamp.encode(), nonce.encode(), payload.encode()))
+
     def verify_signature(self, token: str, payload: str, max_age_seconds: int = 300) -> bool:
         """
         Verifies token signature and expiry WITHOUT consuming it.
@@ -94,8 +132,8 @@ class TokenManager:
                 return False
 
             # 2. Signature Check
-            msg = f"{ts}:{nonce}:{payload}".encode()
-            expected_sig = hmac.new(self.secret, msg, hashlib.sha256).hexdigest()
+            msg = self._message(ts, nonce, payload)
+            expected_sig = hmac.digest(self.secret, msg, "sha256").hex()
             
             return hmac.compare_digest(sig, expected_sig)
             
@@ -122,15 +160,21 @@ class TokenManager:
                 return False
             
             # 2. Anti-Replay: Check if already used
-            if token in self._used_tokens:
+            # (verified above, so the last part is 64 lowercase hex chars)
+            key = bytes.fromhex(token.rsplit('.', 1)[1])
+            if key in self._used_tokens:
                 # Token was already consumed
                 return False
             
             # 3. Consume: Mark as used
-            self._used_tokens[token] = time.time() + max_age_seconds
+            expiry = time.time() + max_age_seconds
+            self._used_tokens[key] = expiry
+            heapq.heappush(self._expiry_heap, (expiry, key))
             
-            # 4. Cleanup old tokens (basic TTL)
-            self._cleanup_expired_tokens()
+            # 4. Cleanup runs in the background; without it (no event loop),
+            # prune inline once the store grows large
+            if self._cleanup_task is None and len(self._used_tokens) > CLEANUP_HIGH_WATER:
+                self._cleanup_expired_tokens()
             
             return True
     
@@ -138,14 +182,16 @@ class TokenManager:
         """
         Removes expired tokens from the in-memory store.
         
-        Called during verify_and_consume to prevent unbounded growth.
+        Called by the background cleanup task (start_cleanup), or inline by
+        verify_and_consume past CLEANUP_HIGH_WATER; caller holds self._lock.
         In production with Redis, this is handled by TTL automatically.
         """
         now = time.time()
-        # Remove tokens past their expiry
-        expired = [token for token, expiry in self._used_tokens.items() if expiry < now]
-        for token in expired:
-            del self._used_tokens[token]
+        # Remove tokens past their expiry: O(k expired), not a full scan
+        heap = self._expiry_heap
+        while heap and heap[0][0] < now:
+            _, key = heapq.heappop(heap)
+            del self._used_tokens[key]
     
     def is_used(self, token: str) -> bool:
         """
@@ -154,5 +200,9 @@ class TokenManager:
         WARNING: Do NOT use this in approval flow. Use verify_and_consume() instead
         to avoid race conditions.
         """
+        try:
+            key = bytes.fromhex(token.rsplit('.', 1)[-1])
+        except ValueError:
+            return False
         with self._lock:
-            return token in self._used_tokens
+            return key in self._used_tokens
@@ -1,10 +1,19 @@
 import re
-import tempfile
 import os
 from typing import List, Dict, Tuple, TypedDict
 from detect_secrets import SecretsCollection
+from detect_secrets.core.potential_secret import PotentialSecret
+# Private helper (scan_file's per-line pipeline with its filters): pinned to
+# detect-secrets 1.5.x in pyproject, re-check it on any upgrade
+from detect_secrets.core.scan import _process_line_based_plugins
 from detect_secrets.settings import default_settings
 
+_ANY_DIGIT = re.compile(r"\d")
+_PAN_SEPARATORS = str.maketrans("", "", " -")
+
+# Pseudo filename reported to detect-secrets for in-memory scans
+MEMORY_SCAN_NAME = "<memory>"
+
 class PIIFinding(TypedDict):
     type: str # e.g. "EMAIL", "PCI_PAN"
     count: int
@@ -32,43 +41,57 @@ class DLPProcessor:
         "IPV4": r'\b(?:\d{1,3}\.){3}\d{1,3}\b'
     }
 
+    # All patterns in one alternation (named group per type): one scan per
+    # call; at a given position the first listed type wins
+    _COMBINED = re.compile("|".join(f"(?P<{k}>{v})" for k, v in PATTERNS.items()))
+
+    @staticmethod
+    def _may_contain_pii(text: str) -> bool:
+        """
+        Cheap necessary conditions (C-level str scans, no regex): EMAIL needs
+        '@', IPV4 needs 3 dots, PCI_PAN needs 13 digits. False means no
+        pattern can match.
+        """
+        if "@" in text:
+            return True
+        if text.isascii():
+            digits = sum(map(text.count, "0123456789"))
+        else:
+            # \d also matches non-ASCII decimal digits
+            digits = sum(1 for _ in _ANY_DIGIT.finditer(text))
+        return digits >= 13 or (digits >= 4 and text.count(".") >= 3)
+
     def sanitize_pii(self, text: str) -> Tuple[str, List[PIIFinding]]:
         """
         Sanitizes PII from input text.
         Returns: (sanitized_text, findings_metadata)
         """
-        sanitized_text = text
-        findings = []
-
-        for pii_type, pattern in self.PATTERNS.items():
-            matches = list(re.finditer(pattern, text))
-            # Process in reverse order to keep indices valid during replacement
-            for match in reversed(matches):
-                start, end = match.span()
-                original_value = match.group()
-                
-                # Special validation for PCI (Luhn could go here, for now simple length check)
-                if pii_type == "PCI_PAN":
-                    # Remove separators to check digit count
-                    digits = re.sub(r'\D', '', original_value)
-                    if len(digits) < 13 or len(digits) > 16:
-                        continue # False positive
-                
-                redaction_token = f"[REDACTED_{pii_type}]"
-                
-                # Replace in text
-                sanitized_text = (
-                    sanitized_text[:start] + 
-                    redaction_token + 
-                    sanitized_text[end:]
-                )
-
-                findings.append({
-                    "type": pii_type,
-                    "count": 1,
-                    "position": start # approximate original pos
-                })
-        
+        if not self._may_contain_pii(text):
+            return text, []
+
+        findings: List[PIIFinding] = []
+
+        def redact(match: re.Match[str]) -> str:
+            pii_type = match.lastgroup
+            original_value = match.group()
+
+            # Special validation for PCI (Luhn could go here, for now simple length check)
+            if pii_type == "PCI_PAN":
+                # Remove separators to check digit count (the pattern only
+                # admits digits, spaces and dashes, so translate suffices)
+                digits = original_value.translate(_PAN_SEPARATORS)
+                if len(digits) < 13 or len(digits) > 16:
+                    return original_value # False positive
+
+            findings.append({
+                "type": pii_type,
+                "count": 1,
+                "position": match.start() # original pos
+            })
+            return f"[REDACTED_{pii_type}]"
+
+        # sub() builds the result in one pass (no per-match slice rebuild)
+        sanitized_text = self._COMBINED.sub(redact, text)
         return sanitized_text, findings
 
 
@@ -76,47 +99,46 @@ class DLPProcessor:
     def scan_secrets(self, filename: str = None, content: str = None) -> List[SecretFinding]:
         """
         Scans for secrets (API Keys, Tokens) using detect-secrets.
-        Supports scanning a specific file OR content in memory (via temp file).
+        Supports scanning a specific file OR content in memory (never written to disk).
         """
-        findings = []
-        target_file = filename
-        is_temp = False
-
-        try:
-            # 1. Handle Memory Content
-            if content is not None:
-                tmp = tempfile.NamedTemporaryFile(mode='w+', delete=False, suffix=".scan")
-                tmp.write(content)
-                tmp.close()
-                target_file = tmp.name
-                is_temp = True
-            
-            if not target_file or not os.path.exists(target_file):
-                return []
-
-            # 2. Run Detect-Secrets
-            secrets = SecretsCollection()
-            with default_settings():
-                secrets.scan_file(target_file)
-            
-            # 3. Parse Results
-            # SecretsCollection stores results in .data dictionary keyed by filename
-            file_results = secrets.data.get(target_file, [])
-            
-            for secret in file_results:
-                findings.append({
-                    "type": secret.type, # e.g. "AWS Key"
-                    "line": secret.line_number,
-                    "hashed_value": secret.secret_hash, # Safe to log
-                    "is_verified": secret.is_verified
-                })
-                
-        finally:
-            # 4. Cleanup
-            if is_temp and target_file and os.path.exists(target_file):
-                os.remove(target_file)
-        
-        return findings
+        # 1. Handle Memory Content
+        if content is not None:
+            return self._scan_content(content)
+
+        if not filename or not os.path.exists(filename):
+            return []
+
+        # 2. Run Detect-Secrets
+        secrets = SecretsCollection()
+        with default_settings():
+            secrets.scan_file(filename)
+
+        # 3. Parse Results
+        # SecretsCollection stores results in .data dictionary keyed by filename
+        return [self._to_finding(secret) for secret in secrets.data.get(filename, [])]
+
+    @staticmethod
+    def _scan_content(content: str) -> List[SecretFinding]:
+        """
+        Runs detect-secrets' per-line plugin pipeline (the one scan_file
+        uses, minus file-level filters) over content held in memory.
+        """
+        lines = list(enumerate(content.splitlines(), start=1))
+        # Same de-duplication as SecretsCollection: (filename, hash, type)
+        unique: Dict[PotentialSecret, None] = {}
+        with default_settings():
+            for secret in _process_line_based_plugins(lines=lines, filename=MEMORY_SCAN_NAME):
+                unique.setdefault(secret, None)
+        return [DLPProcessor._to_finding(secret) for secret in unique]
+
+    @staticmethod
+    def _to_finding(secret: PotentialSecret) -> SecretFinding:
+        return {
+            "type": secret.type, # e.g. "AWS Key"
+            "line": secret.line_number,
+            "hashed_value": secret.secret_hash, # Safe to log
+            "is_verified": secret.is_verified
+        }
 
     def validate_ingress(self, prompt: str) -> str:
         """
@@ -0,0 +1,66 @@
+import unittest
+import tempfile
+import hashlib
+import json
+import os
+from unittest import mock
+
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
+
+from src.app.core.security import audit
+from src.app.core.security.audit import AuditLogger
+
+
+class TestAuditChainRestart(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.log_path = os.path.join(self.tmpdir.name, "audit.jsonl")
+        self.engine = create_async_engine(
+            f"sqlite+aiosqlite:///{os.path.join(self.tmpdir.name, 'audit.db')}"
+        )
+        async with self.engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        self.session_maker = sessionmaker(self.engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def asyncTearDown(self):
+        await self.engine.dispose()
+        self.tmpdir.cleanup()
+
+    def _read_chain(self) -> list[dict]:
+        with open(self.log_path, "rb") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    # --- A failed SQL insert must not fork the chain on restart ---
+    async def test_restart_after_sql_failure_keeps_chain(self):
+        with mock.patch.object(audit, "async_session_maker", self.session_maker):
+            first = AuditLogger(self.log_path)
+            await first.log_event("E1", {"n": 1}, "ALLOW", "low")
+            # DB down for the second event: it only reaches the JSONL file
+            with mock.patch.object(audit, "async_session_maker", side_effect=RuntimeError("db down")):
+                await first.log_event("E2", {"n": 2}, "ALLOW", "low")
+            await first.aclose()
+
+            # Restart: SQL's newest row is E1, the file's tail is E2
+            restarted = AuditLogger(self.log_path)
+            await restarted.log_event("E3", {"n": 3}, "ALLOW", "low")
+            await restarted.aclose()
+
+        records = self._read_chain()
+        self.assertEqual([r["event"] for r in records], ["E1", "E2", "E3"])
+
+        prev = "0" * 64
+        for record in records:
+            self.assertEqual(record["prev_hash"], prev)
+            body = {k: v for k, v in record.items() if k != "integrity_hash"}
+            h = hashlib.blake2b(prev.encode(), digest_size=32, key=audit._CHAIN_KEY)
+            h.update(b"|")
+            h.update(json.dumps(body, sort_keys=True, separators=(",", ":")).encode())
+            self.assertEqual(record["integrity_hash"], h.hexdigest())
+            prev = record["integrity_hash"]
+
+
+if __name__ == "__main__":
+    unittest.main()
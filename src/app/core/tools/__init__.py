@@ -1,15 +1,18 @@
 """Tools package: MCP integration, idempotency, and tool registry."""
 
-from .mcp_runner import MCPToolRunner, MockMCPToolRunner
+from .mcp_runner import MCPToolRunner, MockMCPToolRunner, get_or_create_runner, get_cache_stats
 from .idempotency import IdempotencyStore, make_idempotency_key, get_idempotency_store
-from .registry import ToolRegistry, get_tool_registry
+from .registry import ToolEntry, ToolRegistry, get_tool_registry
 
 __all__ = [
     "MCPToolRunner",
     "MockMCPToolRunner",
+    "get_or_create_runner",
+    "get_cache_stats",
     "IdempotencyStore",
     "make_idempotency_key",
     "get_idempotency_store",
+    "ToolEntry",
     "ToolRegistry",
     "get_tool_registry"
 ]
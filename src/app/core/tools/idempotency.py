@@ -15,32 +15,41 @@ Use Case:
 
 import time
 import asyncio
-import hashlib
-from typing import Dict, Optional
+from collections import defaultdict
+from typing import Dict, Optional, Set
 from threading import Lock
 
+from blake3 import blake3
 
-def make_idempotency_key(thread_id: str, step_idx: int, args_hash: str) -> str:
+
+# TTL wheel granularity: keys are grouped by expires_at // BUCKET_SECONDS
+BUCKET_SECONDS = 60
+
+
+def make_idempotency_key(thread_id: str, step_idx: int, args_hash: bytes) -> str:
     """
     Generate idempotency key from execution context.
     
-    Format: SHA256(thread_id:step_idx:args_hash)
+    Format: BLAKE3-128(thread_id:step_idx:args_hash)
+    
+    The key is only a dict/Redis key, not a security boundary, so a fast
+    128-bit digest replaces SHA-256.
     
     Args:
         thread_id: Conversation/thread identifier
         step_idx: Step index in plan
-        args_hash: SHA256 hash of canonical args
+        args_hash: Digest of canonical args (raw bytes)
     
     Returns:
-        str: 64-character hex string
+        str: 32-character hex string
     
     Example:
-        >>> key = make_idempotency_key("thread-123", 2, "abc123...")
+        >>> key = make_idempotency_key("thread-123", 2, calculate_hash(canonical))
         >>> len(key)
-        64
+        32
     """
-    raw = f"{thread_id}:{step_idx}:{args_hash}".encode('utf-8')
-    return hashlib.sha256(raw).hexdigest()
+    raw = f"{thread_id}:{step_idx}:".encode('utf-8') + args_hash
+    return blake3(raw).hexdigest(length=16)
 
 
 class IdempotencyStore:
@@ -58,12 +67,18 @@ class IdempotencyStore:
         }
     
     Background Cleanup:
-        Runs every 60s to remove expired keys.
+        Runs every 60s. Keys are also filed in a TTL wheel (expiry bucket ->
+        keys), so cleanup drops whole expired buckets instead of scanning
+        the store.
+    
+    Reads are lock-free (a single dict get is atomic under the GIL); the
+    lock only orders writers (set / cleanup / clear).
     """
     
     def __init__(self):
         """Initialize empty store with background cleanup."""
         self._store: Dict[str, Dict[str, object]] = {}
+        self._buckets: Dict[int, Set[str]] = defaultdict(set)
         self._lock = Lock()
         self._cleanup_task: Optional[asyncio.Task] = None
     
@@ -89,15 +104,15 @@ class IdempotencyStore:
             self._cleanup_expired()
     
     def _cleanup_expired(self):
-        """Remove expired keys (called by background task)."""
-        now = time.time()
+        """Drop every bucket that lies entirely in the past (called by background task)."""
+        current = int(time.time()) // BUCKET_SECONDS
         with self._lock:
-            expired_keys = [
-                key for key, data in self._store.items()
-                if data["expires_at"] < now
-            ]
-            for key in expired_keys:
-                del self._store[key]
+            for bucket_id in [b for b in self._buckets if b < current]:
+                for key in self._buckets.pop(bucket_id):
+                    data = self._store.get(key)
+                    # Skip keys re-set since with a later expiry (filed in a newer bucket)
+                    if data is not None and int(data["expires_at"]) // BUCKET_SECONDS == bucket_id:
+                        del self._store[key]
     
     def get(self, key: str) -> Optional[Dict[str, object]]:
         """
@@ -109,17 +124,15 @@ class IdempotencyStore:
         Returns:
             Tool result dict or None if not found/expired
         """
-        with self._lock:
-            data = self._store.get(key)
-            if not data:
-                return None
-            
-            # Check expiry
-            if data["expires_at"] < time.time():
-                del self._store[key]
-                return None
-            
-            return data["value"]
+        data = self._store.get(key)
+        if not data:
+            return None
+        
+        # Check expiry (the entry itself is removed by cleanup)
+        if data["expires_at"] < time.time():
+            return None
+        
+        return data["value"]
     
     def set(self, key: str, value: Dict[str, object], ttl: int = 600) -> None:
         """
@@ -136,11 +149,13 @@ class IdempotencyStore:
                 "value": value,
                 "expires_at": expires_at
             }
+            self._buckets[int(expires_at) // BUCKET_SECONDS].add(key)
     
     def clear(self) -> None:
         """Clear all cached results (useful for testing)."""
         with self._lock:
             self._store.clear()
+            self._buckets.clear()
     
     def size(self) -> int:
         """Get number of cached results."""
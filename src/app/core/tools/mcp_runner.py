@@ -11,9 +11,170 @@ JSON-RPC is handled internally by the MCP SDK - we just call Python methods.
 """
 
 import asyncio
-from typing import Dict, List, Optional
+import hashlib
+import os
+import shutil
+import stat
+import weakref
+from contextlib import AsyncExitStack
+from typing import Callable, Dict, List, Optional
 from pathlib import Path
 
+import orjson
+
+# MCP SDK is resolved once; initialize() reports a missing install
+try:
+    import mcp
+    from mcp.client.stdio import stdio_client
+    _MCP_IMPORT_ERROR: Optional[ImportError] = None
+except ImportError as e:
+    mcp = stdio_client = None
+    _MCP_IMPORT_ERROR = e
+
+# JSON-RPC error class: McpError in SDK 1.x, MCPError in 2.x (optional either way)
+McpError: Optional[type] = None
+# Raised by a session whose server process has exited (anyio is an MCP dependency)
+_TRANSPORT_ERRORS: tuple[type, ...] = ()
+_CONNECTION_CLOSED = -32000  # mcp.types.CONNECTION_CLOSED
+if mcp is not None:
+    try:
+        from mcp.shared import exceptions as _mcp_exceptions
+        McpError = getattr(_mcp_exceptions, "McpError", None) or getattr(_mcp_exceptions, "MCPError", None)
+    except ImportError:
+        pass
+    import anyio
+    _TRANSPORT_ERRORS = (anyio.ClosedResourceError, anyio.BrokenResourceError, anyio.EndOfStream)
+    _CONNECTION_CLOSED = getattr(mcp.types, "CONNECTION_CLOSED", _CONNECTION_CLOSED)
+
+
+def _connection_lost(exc: BaseException) -> bool:
+    """True when exc means the server's stdio session is gone (not a tool error)."""
+    if isinstance(exc, _TRANSPORT_ERRORS):
+        return True
+    return (
+        McpError is not None
+        and isinstance(exc, McpError)
+        and getattr(getattr(exc, "error", None), "code", None) == _CONNECTION_CLOSED
+    )
+
+
+# Discovery results per config, next to the config (.mcp/.discovery_cache/)
+DISCOVERY_CACHE_DIR = ".discovery_cache"
+
+# Optional cross-worker discovery cache (pip install phylactery[redis-cache])
+REDIS_URL = os.getenv("REDIS_URL")
+DISCOVERY_REDIS_TTL = 3600  # seconds
+_redis = None
+
+
+def _discovery_cache_key(config_bytes: bytes, servers: Dict[str, "mcp.StdioServerParameters"]) -> str:
+    """
+    Key for this exact config content plus the files its servers run (the
+    resolved command and any file named in args, by path, mtime and size),
+    so editing the config or upgrading a server binary or script changes it.
+    """
+    h = hashlib.sha256(config_bytes)
+    for server_name, params in sorted(servers.items()):
+        env = params.env or {}
+        command = shutil.which(params.command, path=env.get("PATH")) or params.command
+        h.update(f"\0{server_name}".encode())
+        for file in (command, *params.args):
+            try:
+                st = os.stat(file)
+            except (OSError, ValueError):
+                continue
+            if not stat.S_ISREG(st.st_mode):
+                continue
+            h.update(f"\0{os.path.abspath(file)}:{st.st_mtime_ns}:{st.st_size}".encode())
+    return h.hexdigest()
+
+
+def _discovery_cache_path(config_path: str, cache_key: str) -> Path:
+    """
+    Cache file for a config's discovery results, named <config id>-<key>.json
+    so configs sharing a directory keep their own entries.
+    """
+    config_id = hashlib.sha256(os.path.abspath(config_path).encode()).hexdigest()[:16]
+    return Path(config_path).parent / DISCOVERY_CACHE_DIR / f"{config_id}-{cache_key}.json"
+
+
+def _get_redis():
+    """Shared redis.asyncio client, or None when REDIS_URL is unset or redis is missing."""
+    global _redis
+    if _redis is None and REDIS_URL:
+        try:
+            import redis.asyncio as aioredis
+        except ImportError:
+            return None
+        _redis = aioredis.from_url(REDIS_URL)
+    return _redis
+
+
+async def _load_redis_discovery(
+    cache_key: str,
+) -> Optional[tuple[Dict[str, Dict[str, object]], Dict[str, str]]]:
+    """(tools, tool_servers) seeded by another worker, or None (best effort)."""
+    client = _get_redis()
+    if client is None:
+        return None
+    try:
+        raw = await client.get(f"mcp:tools:{cache_key}")
+        if raw is None:
+            return None
+        data = orjson.loads(raw)
+        return data["tools"], data["servers"]
+    except Exception:
+        return None
+
+
+async def _save_redis_discovery(
+    cache_key: str,
+    tools: Dict[str, Dict[str, object]],
+    tool_servers: Dict[str, str],
+) -> None:
+    """Publishes the catalog for other workers for DISCOVERY_REDIS_TTL (best effort)."""
+    client = _get_redis()
+    if client is None:
+        return
+    try:
+        await client.setex(
+            f"mcp:tools:{cache_key}",
+            DISCOVERY_REDIS_TTL,
+            orjson.dumps({"tools": tools, "servers": tool_servers}),
+        )
+    except Exception:
+        pass
+
+
+def _load_discovery_cache(
+    cache_file: Path,
+) -> Optional[tuple[Dict[str, Dict[str, object]], Dict[str, str]]]:
+    """(tools, tool_servers) from a cache file, or None when missing or unreadable."""
+    try:
+        data = orjson.loads(cache_file.read_bytes())
+        return data["tools"], data["servers"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _save_discovery_cache(
+    cache_file: Path,
+    tools: Dict[str, Dict[str, object]],
+    tool_servers: Dict[str, str],
+) -> None:
+    """Atomically writes the catalog and drops this config's stale entries (best effort)."""
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_file.with_suffix(".tmp")
+        tmp_path.write_bytes(orjson.dumps({"tools": tools, "servers": tool_servers}))
+        os.replace(tmp_path, cache_file)
+        config_id = cache_file.name.partition("-")[0]
+        for stale in cache_file.parent.glob(f"{config_id}-*.json"):
+            if stale != cache_file:
+                stale.unlink(missing_ok=True)
+    except OSError:
+        pass
+
 
 class MCPToolRunner:
     """
@@ -33,16 +194,40 @@ class MCPToolRunner:
             print(result["output"])
     """
     
+    __slots__ = (
+        "tools",
+        "initialized",
+        "_server_configs",
+        "_server_sessions",
+        "_server_locks",
+        "_tool_servers",
+        "_owners",
+        "_closing",
+        "__weakref__",  # Tracked in _live_runners
+    )
+    
     def __init__(self):
         """Initialize empty runner. Call initialize() before use."""
-        self.session = None
         self.tools = {}  # {tool_name: tool_schema}
         self.initialized = False
+        # Servers connect on first use: one long-lived stdio session each, held
+        # open by its _owners task. Calls to the same server are serialized on
+        # its lock (which also guards the connect); different servers run concurrently.
+        self._server_configs: Dict[str, "mcp.StdioServerParameters"] = {}
+        self._server_sessions: Dict[str, "mcp.ClientSession"] = {}
+        self._server_locks: Dict[str, asyncio.Lock] = {}
+        self._tool_servers: Dict[str, str] = {}  # {tool_name: server_name}
+        self._owners: Dict[str, asyncio.Task] = {}
+        self._closing = asyncio.Event()
     
     async def initialize(self, config_path: str) -> None:
         """
         Load MCP servers from config file.
         
+        With a cached tool catalog (disk or Redis) no server is started here;
+        each one connects on the first call routed to it. Otherwise every
+        server is connected and discovered concurrently (and stays connected).
+        
         Config format (.mcp/config.json):
         {
           "mcpServers": {
@@ -67,27 +252,144 @@ class MCPToolRunner:
                 "Create .mcp/config.json with your server configs."
             )
         
-        try:
-            # Import MCP SDK (lazy import to avoid dep issues if not installed)
-            import mcp
-            
-            # Create and initialize session
-            self.session = mcp.ClientSession()
-            await self.session.initialize_from_config(config_path)
-            
-            # Discover tools
-            tools_list = await self.session.list_tools()
-            for tool in tools_list:
-                self.tools[tool["name"]] = tool
-            
-            self.initialized = True
-            
-        except ImportError:
+        if mcp is None:
             raise RuntimeError(
                 "MCP SDK not installed. Run: uv add mcp"
-            )
+            ) from _MCP_IMPORT_ERROR
+
+        try:
+            config_bytes = Path(config_path).read_bytes()
+            servers = orjson.loads(config_bytes).get("mcpServers", {})
+            self._server_configs = {
+                server_name: mcp.StdioServerParameters(
+                    command=server_cfg["command"],
+                    args=server_cfg.get("args", []),
+                    env=server_cfg.get("env"),
+                )
+                for server_name, server_cfg in servers.items()
+            }
+            self._server_locks = {server_name: asyncio.Lock() for server_name in servers}
+
+            # Tool catalog from a previous start (or another worker) with the identical config
+            cache_key = _discovery_cache_key(config_bytes, self._server_configs)
+            cache_file = _discovery_cache_path(config_path, cache_key)
+            cached = _load_discovery_cache(cache_file)
+            if cached is None:
+                cached = await _load_redis_discovery(cache_key)
+                if cached is not None:
+                    _save_discovery_cache(cache_file, *cached)
+
+            if cached is not None:
+                # Cache hit: servers connect lazily in call()
+                self.tools, self._tool_servers = cached
+            else:
+                discovered = await asyncio.gather(*(
+                    self._discover(server_name) for server_name in self._server_configs
+                ))
+                self.tools = {tool["name"]: tool for _, tools in discovered for tool in tools}
+                self._tool_servers = {
+                    tool["name"]: server_name for server_name, tools in discovered for tool in tools
+                }
+                _save_discovery_cache(cache_file, self.tools, self._tool_servers)
+                await _save_redis_discovery(cache_key, self.tools, self._tool_servers)
+
+            self.initialized = True
+            _live_runners.add(self)
+
         except Exception as e:
+            await self.aclose()
             raise RuntimeError(f"Failed to initialize MCP: {str(e)}")
+
+    async def _ensure_server(self, server_name: str) -> "mcp.ClientSession":
+        """
+        Session for server_name, spawning and handshaking on first use.
+        
+        Callers hold the server's lock, so concurrent first calls connect once.
+        """
+        session = self._server_sessions.get(server_name)
+        if session is not None:
+            return session
+        
+        # The stdio/session contexts must be exited by the task that entered
+        # them, so a dedicated owner task holds them until aclose() (the caller
+        # and whoever closes the runner may be different tasks).
+        ready = asyncio.get_running_loop().create_future()
+        owner = asyncio.create_task(self._serve(server_name, ready))
+        self._owners[server_name] = owner
+        try:
+            await ready
+        except BaseException:
+            # Handshake failed or the caller's timeout fired mid-connect
+            self._drop_server(server_name)
+            raise
+        return self._server_sessions[server_name]
+
+    def _drop_server(self, server_name: str) -> None:
+        """
+        Forgets a server's session and cancels its owner; the next call reconnects.
+        
+        The owner deregisters itself once its subprocess is gone, so aclose()
+        still waits for it unless a reconnect has replaced it.
+        """
+        self._server_sessions.pop(server_name, None)
+        owner = self._owners.get(server_name)
+        if owner is not None:
+            owner.cancel()
+
+    async def _serve(self, server_name: str, ready: asyncio.Future) -> None:
+        """Connects one server, then keeps its contexts open until aclose() or _drop_server()."""
+        owner = asyncio.current_task()
+        session = None
+        try:
+            async with AsyncExitStack() as stack:
+                read, write = await stack.enter_async_context(
+                    stdio_client(self._server_configs[server_name])
+                )
+                session = await stack.enter_async_context(mcp.ClientSession(read, write))
+                await session.initialize()
+                self._server_sessions[server_name] = session
+                ready.set_result(None)
+                await self._closing.wait()
+        except BaseException as e:
+            if not ready.done():
+                ready.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+        finally:
+            # A replacement owner may already be registered for this server
+            if session is not None and self._server_sessions.get(server_name) is session:
+                del self._server_sessions[server_name]
+            if self._owners.get(server_name) is owner:
+                del self._owners[server_name]
+
+    async def _discover(self, server_name: str) -> tuple[str, List[Dict[str, object]]]:
+        """Connect one server and list its tools."""
+        async with self._server_locks[server_name]:
+            session = await self._ensure_server(server_name)
+            response = await session.list_tools()
+        return server_name, [
+            {
+                "name": tool.name,
+                "description": tool.description or "",
+                # camelCase in SDK 1.x, snake_case in 2.x
+                "input_schema": getattr(tool, "inputSchema", None) or getattr(tool, "input_schema", None),
+            }
+            for tool in response.tools
+        ]
+
+    async def aclose(self) -> None:
+        """Closes every connected server session (and its subprocess)."""
+        owners = list(self._owners.values())
+        self.initialized = False
+        self._tool_servers.clear()
+        _live_runners.discard(self)
+        self._closing.set()
+        if owners:
+            await asyncio.gather(*owners, return_exceptions=True)
+        self._server_sessions.clear()
+        self._server_locks.clear()
+        self._owners.clear()
+        self._closing = asyncio.Event()
     
     async def call(
         self,
@@ -110,8 +412,8 @@ class MCPToolRunner:
             - "error": str (error message if ok=False)
         
         Error Handling:
-            - ToolNotFoundError → {"ok": False, "error": "Tool not found: ..."}
-            - ToolExecutionError → {"ok": False, "error": "Execution failed: ..."}
+            - Unknown tool → {"ok": False, "error": "Tool not found: ..."}
+            - McpError / isError result → {"ok": False, "error": "Tool execution failed: ..."}
             - TimeoutError → {"ok": False, "error": "Timeout after Xs"}
             - Generic Exception → {"ok": False, "error": "Unexpected error: ..."}
         """
@@ -121,52 +423,107 @@ class MCPToolRunner:
                 "error": "MCPToolRunner not initialized. Call initialize() first."
             }
         
+        server_name = self._tool_servers.get(name)
+        if server_name is None:
+            return {
+                "ok": False,
+                "error": f"Tool not found: {name}"
+            }
+        
         try:
-            # Execute with timeout
-            result = await asyncio.wait_for(
-                self.session.call_tool(name, args),
-                timeout=timeout
-            )
+            # Execute with timeout, one request at a time per server session
+            # (a first call also pays the server's connect within the timeout)
+            async with self._server_locks[server_name]:
+                async with asyncio.timeout(timeout):
+                    session = await self._ensure_server(server_name)
+                    try:
+                        result = await session.call_tool(name, args)
+                    except Exception as e:
+                        # Server process died: reconnect on the next call
+                        if _connection_lost(e):
+                            self._drop_server(server_name)
+                        raise
             
-            # MCP result format: {"content": [{"type": "text", "text": "..."}]}
-            content = result.get("content", [])
+            # MCP result: CallToolResult(content=[TextContent(type="text", text=...)], isError=...)
+            content = result.content or []
             if not content:
                 return {"ok": False, "error": "Empty result from MCP server"}
             
             # Extract text from first content item
             first_item = content[0]
-            if isinstance(first_item, dict):
-                output = first_item.get("text", str(first_item))
-            else:
+            output = getattr(first_item, "text", None)
+            if output is None:
                 output = str(first_item)
             
+            if getattr(result, "isError", None) or getattr(result, "is_error", False):
+                return {"ok": False, "error": f"Tool execution failed: {output}"}
             return {"ok": True, "output": output}
         
-        except asyncio.TimeoutError:
+        except TimeoutError:
             return {
                 "ok": False,
                 "error": f"Tool execution timeout after {timeout}s"
             }
         
         except Exception as e:
-            # Handle known MCP exceptions
-            error_name = type(e).__name__
-            if "ToolNotFound" in error_name:
-                return {
-                    "ok": False,
-                    "error": f"Tool not found: {name}"
-                }
-            elif "ToolExecution" in error_name:
-                return {
-                    "ok": False,
-                    "error": f"Tool execution failed: {str(e)}"
-                }
-            else:
-                return {
-                    "ok": False,
-                    "error": f"Unexpected error ({error_name}): {str(e)}"
-                }
-    
+            # Handle known MCP exceptions (most specific class first)
+            for exc_type in type(e).__mro__:
+                handler = _ERROR_HANDLERS.get(exc_type)
+                if handler is not None:
+                    return {"ok": False, "error": handler(e, name)}
+            return {
+                "ok": False,
+                "error": f"Unexpected error ({type(e).__name__}): {str(e)}"
+            }
+
+    async def call_many(
+        self,
+        requests: List[tuple[str, Dict[str, object]]],
+        max_concurrent: int = 8,
+        stop_on_error: bool = False,
+        per_call_timeout: int = 30
+    ) -> List[Dict[str, object]]:
+        """
+        Execute independent tools concurrently.
+
+        Args:
+            requests: (tool_name, args) pairs
+            max_concurrent: Maximum calls in flight at once (default: 8)
+            stop_on_error: Cancel the remaining calls after the first failure
+            per_call_timeout: Timeout in seconds for each call (default: 30)
+
+        Returns:
+            One call() result per request, in submission order. Calls cancelled
+            by stop_on_error return {"ok": False, "error": "Cancelled: ..."}.
+        """
+        sem = asyncio.Semaphore(max_concurrent)
+
+        async def _run(i: int, name: str, args: Dict[str, object]) -> tuple[int, Dict[str, object]]:
+            async with sem:
+                return i, await self.call(name, args, timeout=per_call_timeout)
+
+        tasks = [
+            asyncio.create_task(_run(i, name, args))
+            for i, (name, args) in enumerate(requests)
+        ]
+        results: List[Optional[Dict[str, object]]] = [None] * len(tasks)
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                i, result = await next_done
+                results[i] = result
+                if stop_on_error and not result["ok"]:
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        return [
+            result if result is not None
+            else {"ok": False, "error": f"Cancelled: {requests[i][0]}"}
+            for i, result in enumerate(results)
+        ]
+
     def list_available_tools(self) -> List[str]:
         """
         Get list of available tool names.
@@ -176,6 +533,15 @@ class MCPToolRunner:
         """
         return list(self.tools.keys())
     
+    def list_tools_with_schemas(self) -> List[tuple[str, Dict[str, object]]]:
+        """
+        Get every tool with its schema in one call (for bulk registration).
+        
+        Returns:
+            (tool_name, tool_schema) pairs; the schema dicts are shared, not copied
+        """
+        return list(self.tools.items())
+    
     def get_tool_schema(self, name: str) -> Optional[Dict[str, object]]:
         """
         Get JSON schema for a specific tool.
@@ -189,6 +555,59 @@ class MCPToolRunner:
         return self.tools.get(name)
 
 
+# Error message per exception class raised by call_tool ({exc_type: (exc, tool_name) -> str})
+_ERROR_HANDLERS: Dict[type, Callable[[Exception, str], str]] = {}
+if McpError is not None:
+    # JSON-RPC error response from the server (unknown tool, bad params, handler failure)
+    _ERROR_HANDLERS[McpError] = lambda e, name: f"Tool execution failed: {e}"
+
+
+# Initialized runners, closed together by close_all_runners() on shutdown
+_live_runners: "weakref.WeakSet[MCPToolRunner]" = weakref.WeakSet()
+
+
+# Process-wide warm runners, one per config path (see get_or_create_runner)
+_RUNNER_CACHE: Dict[str, MCPToolRunner] = {}
+_RUNNER_LOCKS: Dict[str, asyncio.Lock] = {}
+_CACHE_STATS: Dict[str, int] = {"hits": 0, "misses": 0}
+
+
+async def get_or_create_runner(config_path: str) -> MCPToolRunner:
+    """
+    Returns the initialized runner for config_path, creating it on first use.
+    
+    Concurrent first calls for the same path wait on a per-path lock, so
+    servers are spawned once. A failed initialize raises and caches nothing.
+    """
+    runner = _RUNNER_CACHE.get(config_path)
+    if runner is not None and runner.initialized:
+        _CACHE_STATS["hits"] += 1
+        return runner
+
+    async with _RUNNER_LOCKS.setdefault(config_path, asyncio.Lock()):
+        runner = _RUNNER_CACHE.get(config_path)
+        if runner is not None and runner.initialized:
+            _CACHE_STATS["hits"] += 1
+            return runner
+        _CACHE_STATS["misses"] += 1
+        runner = MCPToolRunner()
+        await runner.initialize(config_path)
+        _RUNNER_CACHE[config_path] = runner
+        return runner
+
+
+def get_cache_stats() -> Dict[str, int]:
+    """Runner cache hit/miss counters plus the number of cached runners."""
+    return {**_CACHE_STATS, "size": len(_RUNNER_CACHE)}
+
+
+async def close_all_runners() -> None:
+    """Close every initialized MCPToolRunner (call from the app lifespan)."""
+    _RUNNER_CACHE.clear()
+    for runner in list(_live_runners):
+        await runner.aclose()
+
+
 # For testing without real MCP server
 class MockMCPToolRunner(MCPToolRunner):
     """
@@ -201,6 +620,8 @@ class MockMCPToolRunner(MCPToolRunner):
         # Returns mock data
     """
     
+    __slots__ = ()
+    
     async def initialize(self, config_path: str) -> None:
         """No-op initialization."""
         self.tools = {
@@ -232,4 +653,10 @@ class MockMCPToolRunner(MCPToolRunner):
             return {"ok": False, "error": f"Mock tool not implemented: {name}"}
 
 
-__all__ = ["MCPToolRunner", "MockMCPToolRunner"]
+__all__ = [
+    "MCPToolRunner",
+    "MockMCPToolRunner",
+    "close_all_runners",
+    "get_or_create_runner",
+    "get_cache_stats",
+]
@@ -6,13 +6,28 @@ Responsibilities:
 - Validate tool availability
 - Provide tool schemas for validation
 
+Schemas are disclosed in two tiers: a one-line summary per tool for prompts
+(list_summaries) and the full schema, returned on demand (get_schema).
+
 Benefits:
 - No hardcoded tool lists
 - Automatically supports new MCP servers
 - Enables runtime extensibility
 """
 
-from typing import Dict, Optional
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+# Summary descriptions are truncated to keep the always-in-prompt tier small
+SUMMARY_MAX_CHARS = 120
+
+
+@dataclass(slots=True)
+class ToolEntry:
+    """Summary tier of one registered tool."""
+    name: str
+    description: str
+    source: str  # "mcp" | "custom"
 
 
 class ToolRegistry:
@@ -27,9 +42,36 @@ class ToolRegistry:
             schema = registry.get_schema("read_file")
     """
     
+    __slots__ = (
+        "tools",
+        "_by_name",
+        "_names",
+        "_schemas",
+        "_name_set",
+    )
+    
     def __init__(self):
         """Initialize empty registry."""
-        self.tools: Dict[str, Dict[str, object]] = {}
+        self.tools: Dict[str, ToolEntry] = {}
+        # Parallel arrays indexed by _by_name[name], for iteration-heavy callers.
+        # _schemas is the detail tier, only handed out by get_schema().
+        self._by_name: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._schemas: List[Dict[str, object]] = []
+        # Immutable snapshot of registered names for validators (see allowed_names)
+        self._name_set: frozenset[str] = frozenset()
+    
+    def _register(self, name: str, description: object, source: str, schema: Dict[str, object]) -> None:
+        """Adds a tool or replaces it in place (same index)."""
+        entry = ToolEntry(name=name, description=_one_line(description), source=source)
+        idx = self._by_name.get(name)
+        if idx is None:
+            self._by_name[name] = len(self._names)
+            self._names.append(name)
+            self._schemas.append(schema)
+        else:
+            self._schemas[idx] = schema
+        self.tools[name] = entry
     
     def register_from_mcp(self, mcp_runner) -> None:
         """
@@ -47,16 +89,11 @@ class ToolRegistry:
                 "Call mcp_runner.initialize() first."
             )
         
-        # Get all available tools
-        tool_names = mcp_runner.list_available_tools()
-        
-        for name in tool_names:
-            schema = mcp_runner.get_tool_schema(name)
-            self.tools[name] = {
-                "name": name,
-                "schema": schema or {},
-                "source": "mcp"
-            }
+        # All tools with their schemas in one pass (shares the runner's dicts)
+        for name, schema in mcp_runner.list_tools_with_schemas():
+            schema = schema or {}
+            self._register(name, schema.get("description", ""), "mcp", schema)
+        self._name_set = frozenset(self._names)
     
     def register_custom(self, name: str, schema: Dict[str, object]) -> None:
         """
@@ -66,11 +103,8 @@ class ToolRegistry:
             name: Tool name
             schema: Tool JSON schema
         """
-        self.tools[name] = {
-            "name": name,
-            "schema": schema,
-            "source": "custom"
-        }
+        self._register(name, schema.get("description", ""), "custom", schema)
+        self._name_set = self._name_set | {name}
     
     def is_allowed(self, name: str) -> bool:
         """
@@ -82,7 +116,12 @@ class ToolRegistry:
         Returns:
             bool: True if tool exists in registry
         """
-        return name in self.tools
+        return name in self._name_set
+    
+    @property
+    def allowed_names(self) -> frozenset[str]:
+        """Registered tool names; a new frozenset replaces it on each registration."""
+        return self._name_set
     
     def get_schema(self, name: str) -> Optional[Dict[str, object]]:
         """
@@ -94,21 +133,45 @@ class ToolRegistry:
         Returns:
             Schema dict or None if not found
         """
-        tool = self.tools.get(name)
-        return tool.get("schema") if tool else None
+        idx = self._by_name.get(name)
+        if idx is None:
+            return None
+        return self._schemas[idx]
     
-    def list_tools(self) -> List[str]:
+    def list_tools(self) -> list[str]:
         """
         Get list of all registered tool names.
         
         Returns:
             List of tool names
         """
-        return list(self.tools.keys())
+        return list(self._names)
+    
+    def list_summaries(self) -> List[Dict[str, str]]:
+        """
+        Get the prompt tier: name and one-line description per tool.
+        
+        Returns:
+            List of {"name": ..., "description": ...} dicts
+        """
+        return [
+            {"name": entry.name, "description": entry.description}
+            for entry in self.tools.values()
+        ]
     
     def clear(self) -> None:
         """Clear all registered tools (useful for testing)."""
         self.tools.clear()
+        self._by_name.clear()
+        self._names.clear()
+        self._schemas.clear()
+        self._name_set = frozenset()
+
+
+def _one_line(description: object) -> str:
+    """First line of a description, truncated to SUMMARY_MAX_CHARS."""
+    text = str(description or "").strip()
+    return text.split("\n", 1)[0][:SUMMARY_MAX_CHARS]
 
 
 # Global instance (singleton pattern)
@@ -129,6 +192,7 @@ def get_tool_registry() -> ToolRegistry:
 
 
 __all__ = [
+    "ToolEntry",
     "ToolRegistry",
     "get_tool_registry"
 ]
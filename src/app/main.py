@@ -3,7 +3,12 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
+from .core.brain.nodes import auth_manager
+from .core.db import start_event_writer, stop_event_writer
 from .core.loader import brain
+from .core.security.audit import stop_audit_writers
+from .core.tools.idempotency import get_idempotency_store
+from .core.tools.mcp_runner import close_all_runners
 from .api.routes import auth, chat
 
 
@@ -11,8 +16,19 @@ from .api.routes import auth, chat
 async def lifespan(app: FastAPI) -> AsyncGenerator[None]:
     """Load Brain on Startup."""
     await brain.load_brain()
+    await start_event_writer()
+    # Background expiry of consumed approval tokens and idempotency keys
+    await auth_manager.start_cleanup()
+    await get_idempotency_store().start_cleanup()
     yield
-    # Clean up (if needed)
+    await auth_manager.stop_cleanup()
+    await get_idempotency_store().stop_cleanup()
+    # Flush buffered events before shutdown
+    await stop_event_writer()
+    await stop_audit_writers()
+    # Release pooled MCP server connections
+    await brain.aclose_engines()
+    await close_all_runners()
 
 
 app = FastAPI(title="Phylactery API", version="0.1.0", lifespan=lifespan)
@@ -22,11 +38,20 @@ app.include_router(auth.router)
 app.include_router(chat.router)
 
 
+# Root payload, rebuilt only when brain.loaded_names changes (i.e. on reload)
+_root_snapshot: tuple[object, dict[str, tuple[str, ...] | str]] | None = None
+
+
 @app.get("/")
-def read_root() -> dict[str, list[str] | str]:
+def read_root() -> dict[str, tuple[str, ...] | str]:
     """Root endpoint showing loaded agents and skills."""
-    return {
-        "status": "Phylactery, Alive again!. 💀",
-        "loaded_agents": list(brain.agents.keys()),
-        "loaded_skills": list(brain.skills.keys()),
-    }
+    global _root_snapshot
+    names = brain.loaded_names
+    if _root_snapshot is None or _root_snapshot[0] is not names:
+        agents, skills = names
+        _root_snapshot = (names, {
+            "status": "Phylactery, Alive again!. 💀",
+            "loaded_agents": agents,
+            "loaded_skills": skills,
+        })
+    return _root_snapshot[1]
@@ -1,8 +1,10 @@
 """Session management for Phylactery agents."""
+import heapq
 import os
+import time
 import uuid
-from typing import Dict, Optional
-from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
 
 from .core.engine import AgentEngine
 from .core.loader import brain
@@ -12,8 +14,11 @@ class SessionManager:
     """Manages user sessions and AgentEngine instances."""
     
     def __init__(self):
-        self.sessions: Dict[str, Dict] = {}  # {session_token: {engine, user, created_at, last_activity}}
-        self.session_timeout = timedelta(hours=24)  # Sessions expire after 24h of inactivity
+        self.sessions: Dict[str, Dict] = {}  # {session_token: {engine, user, created_at, expires_at}}
+        self._timeout_s = 24 * 3600  # Sessions expire after 24h of inactivity
+        # (expires_at, token) min-heap on time.monotonic(). Activity extends a
+        # session without touching the heap; stale entries are re-pushed on pop.
+        self._expiry_heap: List[Tuple[float, str]] = []
     
     def authenticate(self, username: str, password: str) -> Optional[str]:
         """Authenticate user and create a session token."""
@@ -22,32 +27,34 @@ class SessionManager:
         
         if username == sudo_username and password == sudo_password:
             session_token = str(uuid.uuid4())
+            expires_at = time.monotonic() + self._timeout_s
             self.sessions[session_token] = {
                 "user": username,
                 "engine": None,  # Will be created on first chat
                 "created_at": datetime.now(),
-                "last_activity": datetime.now()
+                "expires_at": expires_at
             }
+            heapq.heappush(self._expiry_heap, (expires_at, session_token))
             return session_token
         return None
     
     async def get_engine(self, session_token: str, agent_name: str) -> Optional[AgentEngine]:
         """Get or create an AgentEngine for this session."""
-        if session_token not in self.sessions:
+        session = self.sessions.get(session_token)
+        if session is None:
             return None
         
-        session = self.sessions[session_token]
-        
         # Check if session expired
-        if datetime.now() - session["last_activity"] > self.session_timeout:
+        now = time.monotonic()
+        if now > session["expires_at"]:
             del self.sessions[session_token]
             return None
         
         # Update last activity
-        session["last_activity"] = datetime.now()
+        session["expires_at"] = now + self._timeout_s
         
-        # Create engine if it doesn't exist
-        if session["engine"] is None:
+        # Create engine if it doesn't exist (or was evicted and closed)
+        if session["engine"] is None or session["engine"].closed:
             session["engine"] = await brain.get_engine(agent_name)
         
         return session["engine"]
@@ -61,13 +68,18 @@ class SessionManager:
     
     def cleanup_expired_sessions(self):
         """Remove expired sessions."""
-        now = datetime.now()
-        expired = [
-            token for token, session in self.sessions.items()
-            if now - session["last_activity"] > self.session_timeout
-        ]
-        for token in expired:
-            del self.sessions[token]
+        now = time.monotonic()
+        heap = self._expiry_heap
+        while heap and heap[0][0] < now:
+            _, token = heapq.heappop(heap)
+            session = self.sessions.get(token)
+            if session is None:
+                continue  # Logged out
+            if session["expires_at"] < now:
+                del self.sessions[token]
+            else:
+                # Extended by activity since this entry was pushed
+                heapq.heappush(heap, (session["expires_at"], token))
 
 
 # Global session manager instance
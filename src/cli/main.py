@@ -1,3 +1,5 @@
+import atexit
+
 import httpx
 import typer
 from rich.console import Console
@@ -8,6 +10,27 @@ app = typer.Typer()
 console = Console()
 API_URL = "http://127.0.0.1:8000"
 
+# One keep-alive pool for every command (and every turn of the chat loop)
+_CLIENT: httpx.Client | None = None
+
+
+def get_client() -> httpx.Client:
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = httpx.Client(
+            base_url=API_URL,
+            timeout=httpx.Timeout(120.0),
+            limits=httpx.Limits(max_keepalive_connections=4),
+        )
+    return _CLIENT
+
+
+@atexit.register
+def _close_client() -> None:
+    if _CLIENT is not None:
+        _CLIENT.close()
+
+
 def print_banner() -> None:
     banner = r"""
     [bold red]
@@ -28,7 +51,7 @@ def print_banner() -> None:
 def list_agents() -> None:
     """List all awake agents."""
     try:
-        response = httpx.get(f"{API_URL}/")
+        response = get_client().get("/")
         data = response.json()
 
         agents = data.get("loaded_agents", [])
@@ -54,8 +77,8 @@ def chat(
     # 0. One-shot mode (No banner, direct output)
     if message:
         try:
-            response = httpx.post(
-                f"{API_URL}/chat/{agent}",
+            response = get_client().post(
+                f"/chat/{agent}",
                 json={"message": message},
                 timeout=120.0
             )
@@ -79,7 +102,7 @@ def chat(
     console.print(f"[bold white]Connecting to agent:[/bold white] [cyan]{agent}[/cyan]...")
 
     try:
-        response = httpx.get(f"{API_URL}/")
+        response = get_client().get("/")
         agents = response.json().get("loaded_agents", [])
         if agent not in agents:
             console.print(f"[bold red]❌ Agent '{agent}' not found.[/bold red]")
@@ -98,27 +121,44 @@ def chat(
             console.print("[bold red]Disconnecting...[/bold red]")
             break
 
-        with console.status("[bold yellow]Thinking...[/bold yellow]", spinner="dots"):
-            try:
-                response = httpx.post(
-                    f"{API_URL}/chat/{agent}",
-                    json={"message": user_input},
-                    timeout=120.0 # Extended timeout for local LLMs
-                )
-
-                if response.status_code == 200:
-                    data = response.json()
-                    ai_response = data.get("response", "No response content")
-                    console.print(f"\n[bold cyan]{agent}[/bold cyan]: {ai_response}\n")
-                else:
+        # Spinner until the reply starts (a non-streaming server sends nothing before it is done)
+        status = console.status("[bold yellow]Thinking...[/bold yellow]", spinner="dots")
+        status.start()
+        try:
+            # Print tokens as they arrive; JSON bodies (non-streaming server) print whole
+            with get_client().stream(
+                "POST",
+                f"/chat/{agent}",
+                json={"message": user_input},
+                timeout=120.0 # Extended timeout for local LLMs (also the max gap between chunks)
+            ) as response:
+                if response.status_code != 200:
+                    response.read()
+                    status.stop()
                     try:
                         error_detail = response.json().get("detail", response.text)
                         console.print(f"[bold red]Server Error {response.status_code}:[/bold red] {error_detail}")
                     except Exception:
                         console.print(f"[bold red]Error {response.status_code}:[/bold red] {response.text}")
-
-            except httpx.TimeoutException:
-                 console.print("[bold red]❌ Response timed out.[/bold red]")
+                elif response.headers.get("content-type", "").startswith("application/json"):
+                    response.read()
+                    status.stop()
+                    ai_response = response.json().get("response", "No response content")
+                    console.print(f"\n[bold cyan]{agent}[/bold cyan]: {ai_response}\n")
+                else:
+                    chunks = response.iter_text()
+                    first = next(chunks, "")
+                    status.stop()
+                    console.print(f"\n[bold cyan]{agent}[/bold cyan]: ", end="")
+                    console.print(first, end="", markup=False, highlight=False)
+                    for chunk in chunks:
+                        console.print(chunk, end="", markup=False, highlight=False)
+                    console.print("\n")
+
+        except httpx.TimeoutException:
+             console.print("[bold red]❌ Response timed out.[/bold red]")
+        finally:
+            status.stop()
 
 @app.command()
 def doctor() -> None:
@@ -128,7 +168,7 @@ def doctor() -> None:
     # 1. API Check
     try:
         with console.status("[bold white]Checking API...[/bold white]"):
-            response = httpx.get(f"{API_URL}/", timeout=10.0)
+            response = get_client().get("/", timeout=10.0)
             if response.status_code == 200:
                 console.print("✅ [green]API is Alive and breathing.[/green]")
             else:
@@ -141,7 +181,7 @@ def doctor() -> None:
     try:
         with console.status("[bold white]Checking Ollama connection...[/bold white]"):
             # We try to ping the API which in turns pings Ollama
-            response = httpx.post(f"{API_URL}/chat/phylactery", json={"message": "ping"}, timeout=30.0)
+            response = get_client().post("/chat/phylactery", json={"message": "ping"}, timeout=30.0)
             if response.status_code == 200:
                 console.print("✅ [green]Ollama is connected and responding.[/green]")
             else: